@@ -0,0 +1,15 @@
+# 📦 Inti analitik penjualan (dipakai ketiga dashboard Streamlit)
+# Fungsi: Satu implementasi untuk semua dashboard, bisa dipakai & diukur
+#         tanpa Streamlit (lihat benchmark.py dan laporan.py):
+#           periode       - nama file bulan_<M>_<YYYY>.csv & nama bulan
+#           schema        - dtype ringkas, validasi kolom, parsing kolom angka
+#           ingest        - baca CSV ber-cache + pipeline file bulanan
+#           clustering    - K-Means (+ pilih jumlah tier otomatis) ber-cache
+#           aturan        - rekomendasi strategi & catatan produk
+#           cube          - agregat bulan × produk (dashboard bulanan)
+#           perbandingan  - perbandingan antar bulan
+#           filters       - indeks filter, ekspor - file unduhan
+#           store         - dataset tersimpan (Parquet per Tahun/Bulan)
+#         Hanya sumber_daya.py dan tampilan_kmeans.py yang mengimpor
+#         Streamlit. Submodul tidak diimpor di sini supaya halaman awal
+#         tidak ikut membayar impornya (lihat pemanasan.py).
@@ -0,0 +1,93 @@
+# 📐 Mesin aturan (rule engine) berbasis tabel
+# Fungsi: Menghitung rekomendasi strategi dan catatan produk untuk seluruh
+#         kolom sekaligus, bukan baris per baris lewat df.apply. Aturan baru
+#         cukup ditambahkan ke tabel di bawah.
+
+import re
+
+import numpy as np
+import pandas as pd
+
+# Strategi per kategori hasil clustering (termasuk tier tambahan saat jumlah cluster otomatis)
+ATURAN_STRATEGI = {
+    'Terlaris': "Jaga ketersediaan stok & jadikan produk unggulan",
+    'Sangat Laris': "Pertahankan stok & promosi rutin",
+    'Laris': "Tingkatkan promosi jadi sangat laris",
+    'Kurang Laris': "Evaluasi produk/buat bundling",
+    'Tidak Laris': "Pertimbangkan hentikan atau ganti produk",
+}
+STRATEGI_DEFAULT = "Evaluasi produk/buat bundling"
+
+# Tier tanpa nama di ATURAN_STRATEGI (mis. 'Tier 1'..'Tier 6' saat k otomatis
+# di luar LABEL_TIER) memakai strategi menurut peringkatnya: terbawah, tengah, teratas
+STRATEGI_PERINGKAT = (ATURAN_STRATEGI['Kurang Laris'], ATURAN_STRATEGI['Laris'], ATURAN_STRATEGI['Sangat Laris'])
+
+# Catatan produk laris: (kata kunci, catatan), urutan = prioritas
+ATURAN_CATATAN = [
+    (("bulu mata",), "Trend kecantikan akhir tahun"),
+    (("alis",), "Permintaan alat kecantikan meningkat"),
+    (("taplak", "meja makan"), "Dekorasi rumah menjelang liburan"),
+    (("korean",), "Produk viral di media sosial"),
+    (("penjepit",), "Alat kecantikan praktis dan murah"),
+]
+CATATAN_DEFAULT = "Kemungkinan efek diskon/promosi"
+
+
+def _strategi_peringkat(posisi, jumlah, peringkat=STRATEGI_PERINGKAT):
+    bawah, tengah, atas = peringkat
+    if posisi == jumlah - 1:
+        return atas
+    return bawah if posisi == 0 else tengah
+
+
+def terapkan_strategi(kategori, aturan=ATURAN_STRATEGI, default=STRATEGI_DEFAULT):
+    """Lookup strategi per kategori: sekali per kategori unik, lalu take() via kode kategori.
+
+    Kategori yang tidak ada di `aturan` memakai strategi menurut peringkatnya
+    jika kategorinya berurutan (tier hasil clustering), selain itu `default`.
+    Hasilnya bertipe category, jadi teks strategi tidak disalin per baris.
+    """
+    kat = pd.Categorical(kategori)
+    jumlah = len(kat.categories)
+    pilihan = [aturan[c] if c in aturan else _strategi_peringkat(i, jumlah) if kat.ordered else default
+               for i, c in enumerate(kat.categories)]
+    # Kode -1 (NaN) jatuh ke elemen terakhir = default
+    pilihan.append(default)
+    teks_unik = list(dict.fromkeys(pilihan))
+    kode = np.array([teks_unik.index(teks) for teks in pilihan], dtype=np.int32)[kat.codes]
+    return pd.Series(pd.Categorical.from_codes(kode, teks_unik),
+                     index=getattr(kategori, 'index', None), name='Rekomendasi Strategi')
+
+
+def _kompilasi_catatan(aturan):
+    prioritas = {}
+    for i, (kata_kunci, _) in enumerate(aturan):
+        for kata in kata_kunci:
+            prioritas.setdefault(kata.lower(), i)
+    # Lookahead supaya kata kunci yang tumpang tindih tetap terdeteksi;
+    # alternatif diurutkan sesuai prioritas aturan
+    alternatif = "|".join(re.escape(kata) for kata in sorted(prioritas, key=prioritas.get))
+    return re.compile(f"(?=({alternatif}))", re.IGNORECASE), prioritas
+
+
+_POLA_CATATAN, _PRIORITAS_CATATAN = _kompilasi_catatan(ATURAN_CATATAN)
+
+
+def terapkan_catatan(nama_produk, aturan=ATURAN_CATATAN, default=CATATAN_DEFAULT):
+    """Catatan per produk dari aturan pertama yang kata kuncinya muncul di nama produk."""
+    if aturan is ATURAN_CATATAN:
+        pola, prioritas = _POLA_CATATAN, _PRIORITAS_CATATAN
+    else:
+        pola, prioritas = _kompilasi_catatan(aturan)
+    nama_produk = pd.Series(nama_produk)
+    # Dicocokkan per posisi baris: index asli boleh berisi label duplikat
+    # (hasil filter/concat), baru dipasang kembali di akhir
+    hasil = np.full(len(nama_produk), default, dtype=object)
+    if len(nama_produk):
+        # Semua kecocokan sekaligus, lalu ambil aturan dengan prioritas tertinggi per baris
+        cocok = nama_produk.reset_index(drop=True).astype('string').str.extractall(pola)[0]
+        if not cocok.empty:
+            terbaik = cocok.str.lower().map(prioritas).groupby(level=0).min()
+            catatan = np.array([teks for _, teks in aturan], dtype=object)
+            hasil[terbaik.index.to_numpy()] = catatan[terbaik.to_numpy()]
+    return pd.Series(hasil, index=nama_produk.index, dtype=object, name='Catatan')
@@ -0,0 +1,288 @@
+# ⏱️ Benchmark jalur utama dashboard + generator data ekspor sintetis
+# Fungsi: Membuat file ekspor marketplace palsu (kolom & nama file sama
+#         dengan aslinya), lalu mengukur waktu & memori tiap tahap:
+#         parse CSV, fit K-Means, filter, rekomendasi, groupby, render
+#         grafik, dan ekspor CSV. Hasil ditulis sebagai JSON supaya bisa
+#         dibandingkan antar versi. Opsi --cold-start juga mengukur waktu
+#         halaman awal dashboard di interpreter baru (termasuk impor).
+#
+# Contoh:
+#   python -m analitik_penjualan.benchmark --ukuran 1000 100000 1000000 --output hasil_baru.json
+#   python -m analitik_penjualan.benchmark --ukuran 1000 --cold-start --output hasil_baru.json
+#   python -m analitik_penjualan.benchmark --output hasil_baru.json --banding hasil_lama.json
+#   python -m analitik_penjualan.benchmark --buat-data data_sintetis/ --ukuran 200000 --bulan 12
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from io import BytesIO
+
+import numpy as np
+import pandas as pd
+import sklearn
+
+from .aturan import terapkan_strategi
+from .charts import CacheGrafik, gambar_kontribusi, gambar_pie_kategori, gambar_top_produk
+from .clustering import DEFAULT_ENGINE, ENGINE, fit_kategori
+from .filters import IndeksFilter
+from .ingest import CacheCSV
+from .instrumentasi import atur_logging
+from .pemanasan import panaskan, tunggu_pemanasan
+from .periode import nama_partisi
+from .schema import KOLOM_KATEGORI, tambah_juta
+
+UKURAN_DEFAULT = [1_000, 10_000, 100_000]
+DEFAULT_ULANG = 5
+ROOT_REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SCRIPT_DASHBOARD = os.path.join(ROOT_REPO, "Dashboard_Penjualan", "Dashboard_penjualan.py")
+_KATA_PRODUK = np.array([
+    "Bulu Mata Palsu", "Pensil Alis", "Taplak Meja Makan", "Korean Bag", "Penjepit Rambut",
+    "Gelas Unik", "Lampu Tidur", "Kaos Kaki", "Tempat Pensil", "Gantungan Kunci",
+])
+
+
+def buat_ekspor(n, seed=42):
+    """DataFrame ekspor sintetis dengan kolom yang sama seperti file marketplace."""
+    rng = np.random.default_rng(seed)
+    # Distribusi miring (banyak produk sepi, sedikit yang sangat laris) seperti data asli
+    pembeli = rng.pareto(1.5, n).astype(np.int64) * 3
+    produk_terjual = pembeli + rng.poisson(pembeli * 0.2 + 1)
+    harga = rng.choice([9_900, 15_000, 25_000, 49_000, 99_000, 150_000], n)
+    nama = pd.Series(_KATA_PRODUK[rng.integers(0, len(_KATA_PRODUK), n)]) + " " + pd.Series(np.arange(n)).astype(str)
+    return pd.DataFrame({
+        'Produk': nama,
+        'Total Pembeli (Pesanan Dibuat)': pembeli,
+        'Produk (Pesanan Dibuat)': produk_terjual,
+        'Total Penjualan (Pesanan Dibuat) (IDR)': produk_terjual * harga,
+    })
+
+
+def tulis_ekspor(folder, n, bulan, tahun, seed=42):
+    """Tulis satu file `bulan_<M>_<YYYY>.csv` dan kembalikan path-nya."""
+    os.makedirs(folder, exist_ok=True)
+    path = os.path.join(folder, nama_partisi(tahun, bulan))
+    buat_ekspor(n, seed).to_csv(path, index=False)
+    return path
+
+
+def ukur(hasil, ukuran, tahap, fungsi, ulang=DEFAULT_ULANG):
+    """Catat waktu & puncak alokasi satu tahap; kembalikan nilai dari `fungsi`.
+
+    `fungsi()` mengembalikan (nilai, jumlah baris). Puncak alokasi diukur
+    di satu putaran dengan tracemalloc (sekaligus pemanasan); wall & CPU
+    time adalah median dari `ulang` putaran berikutnya tanpa tracemalloc,
+    karena tracing memperlambat alokasi dan satu putaran saja terlalu noisy.
+    """
+    tracemalloc.start()
+    try:
+        nilai, baris = fungsi()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    wall, cpu = [], []
+    for _ in range(ulang):
+        mulai_wall, mulai_cpu = time.perf_counter(), time.process_time()
+        fungsi()
+        wall.append(time.perf_counter() - mulai_wall)
+        cpu.append(time.process_time() - mulai_cpu)
+    hasil.append({'ukuran': ukuran, 'tahap': tahap, 'baris': baris,
+                  'wall_s': float(np.median(wall)), 'cpu_s': float(np.median(cpu)),
+                  'peak_mb': peak / (1024 * 1024), 'ulang': ulang})
+    return nilai
+
+
+def jalankan_satu(n, engine=DEFAULT_ENGINE, seed=42, ulang=DEFAULT_ULANG):
+    hasil = []
+    data = buat_ekspor(n, seed).to_csv(index=False).encode("utf-8")
+
+    def parse_csv():
+        # Tanpa cache memori maupun disk (DASHBOARD_CACHE_DIR): setiap putaran benar-benar parsing
+        df = CacheCSV(max_bytes=0, folder=None).baca(data)
+        return df, len(df)
+    df = tambah_juta(ukur(hasil, n, "parse_csv", parse_csv, ulang))
+
+    hasil_cluster = ukur(hasil, n, f"kmeans_fit_{engine}",
+                         lambda: (fit_kategori(df, engine=engine), len(df)), ulang)
+    df['Cluster'] = hasil_cluster.labels
+    df['Kategori'] = df['Cluster'].map(hasil_cluster.label_map).astype(KOLOM_KATEGORI['Kategori'])
+
+    # Filter: bangun indeks sekali, lalu query seperti geser slider
+    pembeli, juta = 'Total Pembeli (Pesanan Dibuat)', 'Total Penjualan (Juta)'
+    indeks = ukur(hasil, n, "filter_indeks_build",
+                  lambda: (IndeksFilter(df, [pembeli, juta], ['Kategori']), len(df)), ulang)
+    rentang = {pembeli: (0, float(df[pembeli].quantile(0.9))), juta: indeks.batas(juta)}
+
+    def filter_query():
+        posisi = indeks.cari(anggota={'Kategori': ['Laris', 'Sangat Laris']}, rentang=rentang)
+        return None, len(df) if posisi is None else len(posisi)
+    ukur(hasil, n, "filter_query", filter_query, ulang)
+
+    def filter_mask():
+        return None, int((df['Kategori'].isin(['Laris', 'Sangat Laris'])
+                          & df[pembeli].between(*rentang[pembeli])
+                          & df[juta].between(*rentang[juta])).sum())
+    ukur(hasil, n, "filter_mask", filter_mask, ulang)
+
+    df['Rekomendasi Strategi'] = ukur(hasil, n, "rekomendasi",
+                                      lambda: (terapkan_strategi(df['Kategori']), len(df)), ulang)
+
+    def groupby_ringkasan():
+        kategori_counts = df['Kategori'].value_counts()
+        kategori_counts = kategori_counts[kategori_counts > 0]
+        kontribusi = df.groupby('Kategori', observed=True)[juta].sum().sort_values(ascending=False)
+        top_produk = df.sort_values(by='Produk (Pesanan Dibuat)', ascending=False).head(10)
+        return (kategori_counts, kontribusi, top_produk), len(df)
+    kategori_counts, kontribusi, top_produk = ukur(hasil, n, "groupby_ringkasan", groupby_ringkasan, ulang)
+
+    def render_grafik():
+        grafik = CacheGrafik(max_bytes=0)
+        grafik.render("top_produk", top_produk[['Produk', 'Produk (Pesanan Dibuat)']].astype({'Produk': str}),
+                      gambar_top_produk, figsize=(6, 4))
+        grafik.render("pie_kategori", kategori_counts, gambar_pie_kategori, figsize=(6.4, 4.8))
+        grafik.render("kontribusi", kontribusi, gambar_kontribusi, figsize=(6, 4))
+        return None, len(kategori_counts) + len(kontribusi) + len(top_produk)
+    ukur(hasil, n, "render_grafik", render_grafik, ulang)
+
+    def ekspor_csv():
+        df.to_csv(BytesIO(), index=False)
+        return None, len(df)
+    ukur(hasil, n, "ekspor_csv", ekspor_csv, ulang)
+    return hasil
+
+
+# Dijalankan di interpreter baru: halaman awal (belum ada upload) lalu tunggu pemanasan
+_KODE_COLD_START = """
+import json, os, sys, time
+mulai = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+sys.path.insert(0, sys.argv[2])
+AppTest.from_file(sys.argv[1], default_timeout=300).run()
+halaman = time.perf_counter()
+from analitik_penjualan.pemanasan import MODUL_BERAT, tunggu_pemanasan
+sudah = [m for m in MODUL_BERAT if m in sys.modules]
+tunggu_pemanasan()
+print(json.dumps({"halaman_s": halaman - mulai, "pemanasan_s": time.perf_counter() - mulai, "modul_berat": sudah}))
+"""
+
+
+def ukur_cold_start(script=SCRIPT_DASHBOARD, ulang=3):
+    """Cold start dashboard di proses baru, median dari `ulang` kali.
+
+    `cold_start_halaman`: impor + render halaman awal dengan pemanasan
+    dimatikan (modul berat tidak boleh ikut terimpor). `cold_start_pemanasan`:
+    sampai semua modul berat selesai dipanaskan di latar belakang.
+    """
+    ukuran = {}
+    for nama, env in (("halaman", {"DASHBOARD_WARMUP": "0"}), ("pemanasan", {})):
+        waktu = []
+        for _ in range(ulang):
+            keluaran = subprocess.run([sys.executable, "-c", _KODE_COLD_START, script, ROOT_REPO], check=True,
+                                      capture_output=True, text=True, env={**os.environ, **env})
+            hasil = json.loads(keluaran.stdout.strip().splitlines()[-1])
+            waktu.append(hasil[f"{nama}_s"])
+            if nama == "halaman" and hasil["modul_berat"]:
+                print(f"⚠️ modul berat terimpor di halaman awal: {hasil['modul_berat']}", file=sys.stderr)
+        ukuran[nama] = float(np.median(waktu))
+    return [{'ukuran': 0, 'tahap': f"cold_start_{nama}", 'baris': None, 'wall_s': detik,
+             'cpu_s': None, 'peak_mb': None} for nama, detik in ukuran.items()]
+
+
+def banding(hasil_baru, hasil_lama, toleransi, min_selisih=0.005):
+    """Cetak perbandingan wall time per (ukuran, tahap); kembalikan daftar regresi.
+
+    Selisih di bawah `min_selisih` detik diabaikan supaya tahap yang sangat
+    cepat tidak ditandai regresi hanya karena noise.
+    """
+    lama = {(r['ukuran'], r['tahap']): r for r in hasil_lama['hasil']}
+    regresi = []
+    print(f"{'ukuran':>10} {'tahap':<24} {'lama (s)':>10} {'baru (s)':>10} {'rasio':>7}")
+    for r in hasil_baru['hasil']:
+        dulu = lama.get((r['ukuran'], r['tahap']))
+        if not dulu:
+            continue
+        rasio = r['wall_s'] / dulu['wall_s'] if dulu['wall_s'] else float('inf')
+        tanda = ""
+        if rasio > 1 + toleransi and r['wall_s'] - dulu['wall_s'] >= min_selisih:
+            tanda = "  ⚠️ regresi"
+            regresi.append((r['ukuran'], r['tahap'], rasio))
+        print(f"{r['ukuran']:>10} {r['tahap']:<24} {dulu['wall_s']:>10.4f} {r['wall_s']:>10.4f} {rasio:>7.2f}{tanda}")
+    return regresi
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark jalur utama dashboard penjualan")
+    parser.add_argument("--ukuran", type=int, nargs="+", default=UKURAN_DEFAULT,
+                        help="jumlah baris data sintetis (1k sampai 10M)")
+    parser.add_argument("--engine", choices=ENGINE, default=DEFAULT_ENGINE, help="mesin clustering")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--ulang", type=int, default=DEFAULT_ULANG,
+                        help="jumlah pengulangan per tahap; wall/CPU time yang dicatat adalah mediannya")
+    parser.add_argument("--output", default="hasil_benchmark.json", help="file JSON hasil")
+    parser.add_argument("--banding", help="JSON hasil sebelumnya untuk dibandingkan")
+    parser.add_argument("--toleransi", type=float, default=0.2,
+                        help="batas kenaikan wall time sebelum dianggap regresi (0.2 = 20%%)")
+    parser.add_argument("--min-selisih", type=float, default=0.005,
+                        help="selisih wall time minimum (detik) untuk dianggap regresi")
+    parser.add_argument("--buat-data", metavar="FOLDER",
+                        help="hanya tulis file bulan_<M>_<YYYY>.csv sintetis ke FOLDER lalu keluar")
+    parser.add_argument("--bulan", type=int, default=12, help="jumlah file bulanan untuk --buat-data")
+    parser.add_argument("--tahun", type=int, default=2024, help="tahun awal untuk --buat-data")
+    parser.add_argument("--cold-start", action="store_true",
+                        help="ukur juga waktu halaman awal dashboard di interpreter baru")
+    args = parser.parse_args(argv)
+    atur_logging()
+
+    if args.buat_data:
+        for i in range(args.bulan):
+            tahun, bulan = args.tahun + i // 12, i % 12 + 1
+            for n in args.ukuran:
+                folder = args.buat_data if len(args.ukuran) == 1 else os.path.join(args.buat_data, str(n))
+                print(tulis_ekspor(folder, n, bulan, tahun, seed=args.seed + i))
+        return 0
+
+    hasil = []
+    if args.cold_start:
+        print("▶ cold start", file=sys.stderr)
+        hasil.extend(ukur_cold_start())
+    # Impor modul berat di luar pengukuran supaya tidak masuk ke tahap pertama
+    panaskan()
+    tunggu_pemanasan()
+    for n in args.ukuran:
+        print(f"▶ {n:,} baris", file=sys.stderr)
+        hasil.extend(jalankan_satu(n, args.engine, args.seed, args.ulang))
+
+    laporan = {
+        'meta': {
+            'waktu': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'pandas': pd.__version__,
+            'numpy': np.__version__,
+            'sklearn': sklearn.__version__,
+            'platform': platform.platform(),
+            'cpu': os.cpu_count(),
+            'engine': args.engine,
+            'seed': args.seed,
+            'ulang': args.ulang,
+        },
+        'hasil': hasil,
+    }
+    with open(args.output, "w") as f:
+        json.dump(laporan, f, indent=2)
+    print(f"Hasil ditulis ke {args.output}", file=sys.stderr)
+
+    if args.banding:
+        with open(args.banding) as f:
+            regresi = banding(laporan, json.load(f), args.toleransi, args.min_selisih)
+        if regresi:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
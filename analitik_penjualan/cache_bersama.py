@@ -0,0 +1,199 @@
+# 🤝 Cache bersama antar sesi (memori + disk opsional)
+# Fungsi: Satu cache tingkat proses yang dipakai semua sesi Streamlit,
+#         dengan kunci hash isi data. Jika beberapa sesi meminta kunci yang
+#         sama bersamaan, hanya satu yang menghitung (single-flight); sesi
+#         lain menunggu hasilnya. Entri dibuang berdasarkan umur (TTL) dan
+#         total ukuran (LRU). Jika DASHBOARD_CACHE_DIR diisi, hasil juga
+#         disimpan di disk sehingga tetap ada setelah server restart.
+#
+# File cache di disk memakai pickle: folder ini hanya boleh ditulis oleh
+# server dashboard sendiri.
+
+import hashlib
+import os
+import pickle
+import sys
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from contextlib import suppress
+from dataclasses import fields, is_dataclass
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_TTL = float(os.environ.get("DASHBOARD_CACHE_TTL", str(24 * 3600)))
+DEFAULT_CACHE_DIR = os.environ.get("DASHBOARD_CACHE_DIR") or None
+DEFAULT_DISK_MB = int(os.environ.get("DASHBOARD_DISK_CACHE_MB", "2048"))
+
+
+def ukuran_objek(nilai):
+    """Perkiraan memori (byte) untuk DataFrame/Series, array, dataclass, tuple/list/dict."""
+    if isinstance(nilai, pd.DataFrame):
+        return int(nilai.memory_usage(deep=True).sum())
+    if isinstance(nilai, (pd.Series, pd.Index)):
+        return int(nilai.memory_usage(deep=True))
+    if isinstance(nilai, np.ndarray):
+        return nilai.nbytes
+    if is_dataclass(nilai):
+        return sum(ukuran_objek(getattr(nilai, f.name)) for f in fields(nilai))
+    if isinstance(nilai, (tuple, list)):
+        return sys.getsizeof(nilai) + sum(ukuran_objek(v) for v in nilai)
+    if isinstance(nilai, dict):
+        return sys.getsizeof(nilai) + sum(ukuran_objek(k) + ukuran_objek(v) for k, v in nilai.items())
+    return sys.getsizeof(nilai)
+
+
+class CacheBersama:
+    def __init__(self, nama, max_bytes, ttl=DEFAULT_TTL, folder=DEFAULT_CACHE_DIR,
+                 max_disk_bytes=DEFAULT_DISK_MB * 1024 * 1024, ukuran=ukuran_objek):
+        self.nama = nama
+        self.max_bytes = max_bytes
+        self.ttl = ttl  # detik; 0 atau None = tidak kedaluwarsa
+        self.folder = os.path.join(folder, nama) if folder else None
+        self.max_disk_bytes = max_disk_bytes
+        self.ukuran = ukuran
+        self.hits = 0
+        self.misses = 0
+        self.disk_hits = 0
+        self.menunggu = 0  # permintaan yang ikut menunggu hitungan sesi lain
+        self.total_bytes = 0
+        self._data = OrderedDict()  # kunci -> (nilai, ukuran, waktu simpan)
+        self._proses = {}           # kunci -> Future hitungan yang sedang berjalan
+        self._lock = threading.Lock()
+
+    def _kedaluwarsa(self, waktu):
+        return bool(self.ttl) and time.time() - waktu > self.ttl
+
+    def _buang(self, kunci):
+        _, ukuran, _ = self._data.pop(kunci)
+        self.total_bytes -= ukuran
+
+    def ambil(self, kunci, hitung):
+        """Nilai untuk `kunci`; `hitung()` hanya dijalankan sekali walau diminta banyak sesi bersamaan."""
+        with self._lock:
+            entri = self._data.get(kunci)
+            if entri is not None:
+                if not self._kedaluwarsa(entri[2]):
+                    self._data.move_to_end(kunci)
+                    self.hits += 1
+                    return entri[0]
+                self._buang(kunci)
+            future = self._proses.get(kunci)
+            pemilik = future is None
+            if pemilik:
+                future = self._proses[kunci] = Future()
+            else:
+                self.menunggu += 1
+
+        if not pemilik:
+            return future.result()
+        try:
+            nilai = self._baca_disk(kunci)
+            if nilai is None:
+                with self._lock:
+                    self.misses += 1
+                nilai = hitung()
+                self._tulis_disk(kunci, nilai)
+            else:
+                with self._lock:
+                    self.disk_hits += 1
+            self.simpan(kunci, nilai)
+            future.set_result(nilai)
+            return nilai
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._proses.pop(kunci, None)
+
+    def simpan(self, kunci, nilai):
+        ukuran = self.ukuran(nilai)
+        with self._lock:
+            if kunci in self._data:
+                self._buang(kunci)
+            # Nilai yang lebih besar dari seluruh budget tidak disimpan
+            if ukuran > self.max_bytes:
+                return
+            self._data[kunci] = (nilai, ukuran, time.time())
+            self.total_bytes += ukuran
+            # Buang yang kedaluwarsa dulu, lalu yang paling lama tidak dipakai
+            for lama in [k for k, (_, _, waktu) in self._data.items() if self._kedaluwarsa(waktu)]:
+                self._buang(lama)
+            while self.total_bytes > self.max_bytes:
+                self._buang(next(iter(self._data)))
+
+    def nilai(self):
+        """Salinan daftar nilai yang sedang tersimpan di memori."""
+        with self._lock:
+            return [nilai for nilai, _, _ in self._data.values()]
+
+    # Disk (opsional)
+    def _path(self, kunci):
+        return os.path.join(self.folder, hashlib.sha256(repr(kunci).encode("utf-8")).hexdigest() + ".pkl")
+
+    def _baca_disk(self, kunci):
+        if not self.folder:
+            return None
+        path = self._path(kunci)
+        try:
+            if self._kedaluwarsa(os.path.getmtime(path)):
+                os.remove(path)
+                return None
+            with open(path, "rb") as f:
+                return pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError):
+            return None
+
+    def _tulis_disk(self, kunci, nilai):
+        if not self.folder:
+            return
+        os.makedirs(self.folder, exist_ok=True)
+        # Tulis ke file sementara lalu rename, sama seperti DatasetStore
+        fd, tmp = tempfile.mkstemp(dir=self.folder, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump(nilai, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, self._path(kunci))
+        except BaseException:
+            os.remove(tmp)
+            raise
+        self._rapikan_disk()
+
+    def _rapikan_disk(self):
+        """Hapus file kedaluwarsa, lalu file tertua sampai total ukuran di bawah batas."""
+        file = []
+        for entri in os.scandir(self.folder):
+            if not entri.name.endswith(".pkl"):
+                continue
+            try:
+                info = entri.stat()
+            except FileNotFoundError:
+                continue
+            if self._kedaluwarsa(info.st_mtime):
+                with suppress(FileNotFoundError):  # bisa sudah dihapus proses/thread lain
+                    os.remove(entri.path)
+            else:
+                file.append((info.st_mtime, info.st_size, entri.path))
+        total = sum(ukuran for _, ukuran, _ in file)
+        for _, ukuran, path in sorted(file):
+            if total <= self.max_disk_bytes:
+                break
+            with suppress(FileNotFoundError):
+                os.remove(path)
+            total -= ukuran
+
+    def statistik(self):
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "disk_hits": self.disk_hits,
+                "menunggu": self.menunggu,
+                "entri": len(self._data),
+                "ukuran_mb": self.total_bytes / (1024 * 1024),
+                "batas_mb": self.max_bytes / (1024 * 1024),
+            }
@@ -0,0 +1,136 @@
+# 🖼️ Cache render grafik Matplotlib/Seaborn
+# Fungsi: Menyimpan hasil render grafik (PNG/SVG) dengan kunci hash data
+#         agregat + parameter plot. Grafik yang datanya tidak berubah
+#         langsung diambil dari cache, dan setiap figure selalu ditutup
+#         setelah dirender supaya memori proses tidak terus bertambah.
+#         Matplotlib/Seaborn baru diimpor saat grafik pertama dirender
+#         (lihat pemanasan.py), bukan saat dashboard dibuka.
+
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from io import BytesIO
+
+import pandas as pd
+
+DEFAULT_CACHE_GRAFIK_MB = int(os.environ.get("DASHBOARD_CHART_CACHE_MB", "64"))
+
+
+def hash_data(data):
+    """Hash isi DataFrame/Series (nilai, index, nama kolom)."""
+    h = hashlib.sha256()
+    if data is not None:
+        h.update(pd.util.hash_pandas_object(data, index=True).to_numpy().tobytes())
+        nama = data.columns if isinstance(data, pd.DataFrame) else [data.name]
+        h.update(repr(list(nama)).encode("utf-8"))
+    return h.hexdigest()
+
+
+class CacheGrafik:
+    def __init__(self, max_bytes=DEFAULT_CACHE_GRAFIK_MB * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.total_bytes = 0
+        self._data = OrderedDict()
+        # pyplot tidak thread-safe; satu render pada satu waktu
+        self._lock = threading.Lock()
+
+    def render(self, nama, data, gambar, figsize=(6, 4), format="png", dpi=200, **param):
+        """Render grafik dan kembalikan bytes-nya.
+
+        `gambar(ax, data, **param)` menggambar ke `ax`. Kunci cache dibentuk
+        dari `nama`, isi `data`, ukuran, format, dan `param`, jadi semua yang
+        memengaruhi hasil gambar harus dilewatkan sebagai argumen.
+        """
+        kunci = (nama, hash_data(data), tuple(figsize), format, dpi, repr(sorted(param.items())))
+        with self._lock:
+            if kunci in self._data:
+                self._data.move_to_end(kunci)
+                self.hits += 1
+                return self._data[kunci]
+            self.misses += 1
+
+            import matplotlib.pyplot as plt  # impor tertunda, lihat pemanasan.py
+
+            fig, ax = plt.subplots(figsize=figsize)
+            try:
+                gambar(ax, data, **param)
+                buffer = BytesIO()
+                fig.savefig(buffer, format=format, dpi=dpi, bbox_inches="tight")
+            finally:
+                plt.close(fig)
+            hasil = buffer.getvalue()
+
+            if len(hasil) <= self.max_bytes:
+                self._data[kunci] = hasil
+                self.total_bytes += len(hasil)
+                while self.total_bytes > self.max_bytes:
+                    _, lama = self._data.popitem(last=False)
+                    self.total_bytes -= len(lama)
+            return hasil
+
+    def statistik(self):
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "entri": len(self._data),
+                "ukuran_mb": self.total_bytes / (1024 * 1024),
+            }
+
+
+# Fungsi gambar untuk CacheGrafik.render: gambar(ax, data, **param)
+def gambar_top_produk(ax, data):
+    import seaborn as sns
+
+    sns.barplot(x='Produk (Pesanan Dibuat)', y='Produk', data=data, palette="viridis", ax=ax)
+    ax.set_title("Top 10 Produk Terlaris")
+
+
+def gambar_pie_kategori(ax, data):
+    import seaborn as sns
+
+    ax.pie(data, labels=data.index, autopct='%1.1f%%', startangle=140,
+           colors=sns.color_palette("pastel"))
+    ax.axis('equal')
+    ax.set_title("Distribusi Kategori Produk")
+
+
+def gambar_pesanan_bulanan(ax, data):
+    import seaborn as sns
+
+    sns.barplot(x='Bulan', y='Total Pembeli (Pesanan Dibuat)', hue='Tahun', data=data, palette='tab10', ax=ax)
+    ax.set_title("Total Pesanan per Bulan per Tahun")
+    ax.set_xlabel("Bulan")
+    ax.set_ylabel("Total Pesanan")
+
+
+def gambar_kontribusi(ax, data):
+    import seaborn as sns
+
+    sns.barplot(x=data.values, y=data.index, palette="Blues_d", ax=ax)
+    ax.set_title("Kontribusi Penjualan per Kategori")
+
+
+def gambar_penjualan_bulanan(ax, data):
+    import seaborn as sns
+
+    sns.barplot(data=data, x='Nama_Bulan', y='Jumlah', hue='Tahun', palette='tab10', ax=ax)
+    ax.set_ylabel("Total Pesanan")
+    ax.set_xlabel("Bulan")
+    ax.tick_params(axis='x', labelrotation=45)
+
+
+def gambar_top5(ax, data, judul):
+    import seaborn as sns
+
+    sns.barplot(x=data['Jumlah'].values, y=data.index, color='#FFB47D', ax=ax)
+    ax.set_title(judul, fontsize=18, fontweight='bold')
+    ax.set_xlabel("Jumlah Pesanan", fontsize=12)
+
+    # Tambahkan label jumlah & persentase di bar chart
+    for i, (val, pct) in enumerate(zip(data['Jumlah'].values, data['Persentase'].values)):
+        ax.text(val + data['Jumlah'].max() * 0.01, i, f"{pct}%\n{val} pesanan", va='center', fontsize=10)
+    ax.figure.tight_layout()
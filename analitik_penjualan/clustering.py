@@ -0,0 +1,208 @@
+# 🧮 Tahap clustering K-Means ber-cache
+# Fungsi: Menjalankan K-Means sekali per dataset, lalu menyimpan label,
+#         centroid, dan mapping cluster -> kategori supaya filter di
+#         sidebar bisa memakai ulang hasilnya tanpa fit ulang. Jumlah
+#         cluster bisa dipilih otomatis (silhouette pada sampel data).
+#         sklearn baru diimpor saat fit pertama (lihat pemanasan.py).
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+from threadpoolctl import threadpool_limits
+
+from .cache_bersama import DEFAULT_CACHE_DIR, DEFAULT_TTL, CacheBersama
+from .schema import dtype_kategori, label_tier
+
+FITUR_DEFAULT = ('Total Pembeli (Pesanan Dibuat)', 'Produk (Pesanan Dibuat)')
+KOLOM_URUT_DEFAULT = 'Total Penjualan (Juta)'
+
+# Mesin clustering yang tersedia:
+#   kmeans    -> KMeans full-batch (perilaku awal dashboard)
+#   minibatch -> MiniBatchKMeans pada matriks float32
+#   stream    -> MiniBatchKMeans.partial_fit per potongan (chunk) data
+# MiniBatchKMeans dipakai dengan reassignment_ratio=0: data penjualan sangat
+# miring, dan reassignment bawaan memindahkan cluster kecil yang berisi produk
+# terlaris ke titik acak di antara produk sepi (tier jadi tidak bermakna).
+ENGINE = ('kmeans', 'minibatch', 'stream')
+DEFAULT_ENGINE = os.environ.get("DASHBOARD_CLUSTER_ENGINE", "kmeans")
+DEFAULT_BATCH = 65_536
+DEFAULT_CACHE_CLUSTER_MB = int(os.environ.get("DASHBOARD_CLUSTER_CACHE_MB", "128"))
+
+# Pemilihan jumlah cluster otomatis (n_clusters=K_OTOMATIS)
+K_OTOMATIS = 'auto'
+RENTANG_K = range(2, 7)
+DEFAULT_SAMPEL_K = int(os.environ.get("DASHBOARD_AUTO_K_SAMPLE", "10000"))
+SAMPEL_SILHOUETTE = 3_000
+
+
+@dataclass(frozen=True)
+class HasilCluster:
+    labels: np.ndarray       # nomor cluster per baris, urutan sama dengan df
+    centroids: np.ndarray    # cluster_centers_ dari KMeans
+    label_map: dict          # nomor cluster -> label kategori
+
+    @property
+    def dtype_kategori(self):
+        """Dtype kolom Kategori sesuai jumlah cluster hasil fit."""
+        return dtype_kategori(len(self.centroids))
+
+
+@dataclass(frozen=True)
+class PilihanK:
+    k: int                   # jumlah cluster terpilih
+    skor: pd.DataFrame       # per k yang dievaluasi: Inersia & Silhouette (pada sampel)
+
+
+def _matriks_fitur(df, fitur):
+    return df[list(fitur)].to_numpy(dtype=np.float32)
+
+
+def _label_map(cluster_avg, n_clusters):
+    # Urutan cluster berdasarkan rata-rata penjualan (dari kecil ke besar)
+    return dict(zip(cluster_avg.sort_values().index.tolist(), label_tier(n_clusters)))
+
+
+def _hasil(labels, centroids, label_map):
+    labels.setflags(write=False)
+    return HasilCluster(labels=labels, centroids=centroids, label_map=label_map)
+
+
+def fit_kategori(df, fitur=FITUR_DEFAULT, kolom_urut=KOLOM_URUT_DEFAULT,
+                 n_clusters=3, random_state=42, engine=DEFAULT_ENGINE, batch_size=DEFAULT_BATCH):
+    """Fit K-Means lalu urutkan cluster dari rata-rata `kolom_urut` terkecil."""
+    if engine not in ENGINE:
+        raise ValueError(f"engine harus salah satu dari {ENGINE}, bukan {engine!r}")
+    from sklearn.cluster import KMeans, MiniBatchKMeans  # impor tertunda, lihat pemanasan.py
+
+    if engine == 'stream':
+        # Potong DataFrame yang sudah ada di memori menjadi beberapa chunk
+        def buka_chunk():
+            for mulai in range(0, len(df), batch_size):
+                yield df.iloc[mulai:mulai + batch_size]
+        return fit_kategori_stream(buka_chunk, fitur, kolom_urut, n_clusters, random_state, batch_size)
+
+    if engine == 'minibatch':
+        X = _matriks_fitur(df, fitur)
+        kmeans = MiniBatchKMeans(n_clusters=n_clusters, random_state=random_state,
+                                 batch_size=min(batch_size, max(len(X), 1)), n_init=3,
+                                 reassignment_ratio=0)
+    else:
+        X = df[list(fitur)]
+        kmeans = KMeans(n_clusters=n_clusters, random_state=random_state)
+    labels = kmeans.fit_predict(X)
+
+    cluster_avg = pd.Series(df[kolom_urut].to_numpy()).groupby(labels).mean()
+    return _hasil(labels, kmeans.cluster_centers_, _label_map(cluster_avg, n_clusters))
+
+
+def fit_kategori_stream(buka_chunk, fitur=FITUR_DEFAULT, kolom_urut=KOLOM_URUT_DEFAULT,
+                        n_clusters=3, random_state=42, batch_size=DEFAULT_BATCH, epoch=3):
+    """Fit MiniBatchKMeans tanpa memuat seluruh data sekaligus.
+
+    `buka_chunk` adalah fungsi tanpa argumen yang setiap dipanggil
+    mengembalikan iterator DataFrame baru, mis.
+    `lambda: pd.read_csv(path, chunksize=100_000)`. Data dibaca `epoch` kali
+    untuk `partial_fit`, lalu sekali lagi untuk label dan rata-rata
+    `kolom_urut` per cluster.
+    """
+    from sklearn.cluster import MiniBatchKMeans  # impor tertunda, lihat pemanasan.py
+
+    kmeans = MiniBatchKMeans(n_clusters=n_clusters, random_state=random_state, batch_size=batch_size,
+                             reassignment_ratio=0)
+    sisa = None
+    for _ in range(epoch):
+        for chunk in buka_chunk():
+            X = _matriks_fitur(chunk, fitur)
+            if sisa is not None:
+                X = np.concatenate([sisa, X])
+            # partial_fit butuh minimal n_clusters baris untuk inisialisasi
+            if not hasattr(kmeans, 'cluster_centers_') and len(X) < n_clusters:
+                sisa = X
+                continue
+            sisa = None
+            kmeans.partial_fit(X)
+    if sisa is not None:
+        raise ValueError(f"Data terlalu sedikit untuk {n_clusters} cluster")
+    if not hasattr(kmeans, 'cluster_centers_'):
+        raise ValueError("Data kosong, tidak ada yang bisa di-cluster")
+
+    semua_label = []
+    jumlah = np.zeros(n_clusters)
+    banyak = np.zeros(n_clusters, dtype=np.int64)
+    for chunk in buka_chunk():
+        labels = kmeans.predict(_matriks_fitur(chunk, fitur))
+        semua_label.append(labels)
+        jumlah += np.bincount(labels, weights=chunk[kolom_urut].to_numpy(dtype=np.float64), minlength=n_clusters)
+        banyak += np.bincount(labels, minlength=n_clusters)
+
+    terisi = banyak > 0
+    cluster_avg = pd.Series(jumlah[terisi] / banyak[terisi], index=np.flatnonzero(terisi))
+    labels = np.concatenate(semua_label) if semua_label else np.empty(0, dtype=np.int32)
+    return _hasil(labels, kmeans.cluster_centers_, _label_map(cluster_avg, n_clusters))
+
+
+def _evaluasi_k(X, k, random_state):
+    from sklearn.cluster import KMeans  # impor tertunda, lihat pemanasan.py
+    from sklearn.metrics import silhouette_score
+
+    kmeans = KMeans(n_clusters=k, random_state=random_state, n_init=3).fit(X)
+    silhouette = silhouette_score(X, kmeans.labels_, sample_size=min(len(X), SAMPEL_SILHOUETTE),
+                                  random_state=random_state)
+    return kmeans.inertia_, silhouette
+
+
+def pilih_k(df, fitur=FITUR_DEFAULT, rentang=RENTANG_K, sampel=DEFAULT_SAMPEL_K,
+            random_state=42, max_workers=None, default=3):
+    """Pilih jumlah cluster dengan silhouette tertinggi dari `rentang`.
+
+    Evaluasi dilakukan pada sampel acak `sampel` baris, bukan seluruh data,
+    dan setiap k di-fit di thread terpisah (KMeans sklearn melepas GIL). Selama
+    beberapa k berjalan paralel, OpenMP/BLAS dibatasi satu thread per fit
+    supaya jumlah thread tidak melebihi jumlah core.
+    Inersia ikut dicatat untuk metode siku. Jika skor sama, k terkecil
+    dipilih; jika data terlalu sedikit untuk dievaluasi, `default` dipakai.
+    """
+    X = _matriks_fitur(df, fitur)
+    if len(X) > sampel:
+        X = X[np.random.default_rng(random_state).choice(len(X), sampel, replace=False)]
+    # Silhouette butuh 2 <= k < jumlah titik berbeda
+    n_unik = len(np.unique(X, axis=0)) if len(X) else 0
+    kandidat = [k for k in rentang if 2 <= k < n_unik]
+    skor = pd.DataFrame(columns=['Inersia', 'Silhouette'], index=pd.Index([], name='k'), dtype=float)
+    if not kandidat:
+        return PilihanK(k=default, skor=skor)
+
+    max_workers = max_workers or min(len(kandidat), os.cpu_count() or 1)
+    with threadpool_limits(1 if max_workers > 1 else None), ThreadPoolExecutor(max_workers=max_workers) as pool:
+        hasil = list(pool.map(_evaluasi_k, [X] * len(kandidat), kandidat, [random_state] * len(kandidat)))
+    skor = pd.DataFrame(hasil, columns=['Inersia', 'Silhouette'], index=pd.Index(kandidat, name='k'))
+    return PilihanK(k=int(skor['Silhouette'].idxmax()), skor=skor)
+
+
+class CacheCluster:
+    """Cache hasil clustering dengan kunci (hash dataset, kolom fitur), dipakai bersama semua sesi.
+
+    Beberapa sesi yang meminta dataset yang sama bersamaan hanya memicu satu fit.
+    Dengan `n_clusters=K_OTOMATIS`, k dipilih lewat `pilih_k` dan pilihannya
+    ikut disimpan per hash dataset.
+    """
+
+    def __init__(self, max_bytes=DEFAULT_CACHE_CLUSTER_MB * 1024 * 1024, ttl=DEFAULT_TTL, folder=DEFAULT_CACHE_DIR):
+        self._cache = CacheBersama("cluster", max_bytes, ttl=ttl, folder=folder)
+
+    def ambil(self, kunci_dataset, df, fitur=FITUR_DEFAULT,
+              kolom_urut=KOLOM_URUT_DEFAULT, n_clusters=3, random_state=42, engine=DEFAULT_ENGINE):
+        if n_clusters == K_OTOMATIS:
+            n_clusters = self.pilih_k(kunci_dataset, df, fitur, random_state=random_state).k
+        kunci = (kunci_dataset, tuple(fitur), kolom_urut, n_clusters, random_state, engine)
+        return self._cache.ambil(kunci, lambda: fit_kategori(df, fitur, kolom_urut, n_clusters, random_state, engine))
+
+    def pilih_k(self, kunci_dataset, df, fitur=FITUR_DEFAULT, rentang=RENTANG_K, random_state=42):
+        kunci = ('pilih_k', kunci_dataset, tuple(fitur), tuple(rentang), random_state)
+        return self._cache.ambil(kunci, lambda: pilih_k(df, fitur, rentang, random_state=random_state))
+
+    def statistik(self):
+        return self._cache.statistik()
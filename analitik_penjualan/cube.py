@@ -0,0 +1,185 @@
+# 🧊 Kubus ringkasan bulan × produk
+# Fungsi: Menyimpan agregat per produk untuk setiap file bulanan
+#         (jumlah pesanan, pembeli, penjualan IDR). File baru cukup
+#         diagregasi sekali; ringkasan bulanan, bulan terbaik, dan Top 5
+#         dibaca dari kubus, bukan dari baris transaksi mentah. Menambah
+#         atau mengganti satu bulan hanya menghitung ulang total bulan itu
+#         (dan Top 5-nya saat diminta), bukan seluruh riwayat.
+
+import threading
+
+import pandas as pd
+
+from .periode import nama_bulan
+from .schema import angka
+
+KOLOM_UKURAN = {
+    'Jumlah': 'Produk (Pesanan Dibuat)',
+    'Pembeli': 'Total Pembeli (Pesanan Dibuat)',
+    'Penjualan_IDR': 'Total Penjualan (Pesanan Dibuat) (IDR)',
+}
+
+
+def agregasi_produk(df):
+    """Total per produk untuk kolom di KOLOM_UKURAN.
+
+    Kolom pembeli/penjualan yang tidak ada di file dianggap 0. Baris dengan
+    Produk kosong dikumpulkan di label NaN supaya tetap ikut total bulanan.
+    """
+    ukuran = pd.DataFrame({'Produk': df['Produk']})
+    for nama, kolom in KOLOM_UKURAN.items():
+        if nama == 'Jumlah' and 'Jumlah' in df.columns:
+            ukuran[nama] = df['Jumlah']
+        elif kolom in df.columns:
+            ukuran[nama] = angka(df[kolom])
+        else:
+            ukuran[nama] = 0
+    ukuran['Jumlah'] = ukuran['Jumlah'].astype(int)
+    agg = ukuran.groupby('Produk', sort=False, observed=True, dropna=False).sum()
+    agg.index = agg.index.astype(object)  # lepas dtype category agar tidak membawa produk kosong
+    return agg
+
+
+def gabung_agregat(*agg):
+    """Jumlahkan beberapa agregat per produk menjadi satu."""
+    return pd.concat(agg).groupby(level=0, sort=False, dropna=False).sum()
+
+
+class KubusRingkasan:
+    """Agregat per bulan × produk, diperbarui per bulan.
+
+    Aman dipakai bersama beberapa sesi (mis. riwayat dari dataset tersimpan
+    yang di-cache per proses). Hasil yang dikembalikan dipakai bersama,
+    jangan diubah di tempat.
+    """
+
+    def __init__(self):
+        self._bagian = {}       # kunci sumber -> (tahun, bulan, DataFrame per Produk)
+        self._per_bulan = {}    # (tahun, bulan) -> set kunci sumber
+        self._total = {}        # (tahun, bulan) -> dict total KOLOM_UKURAN bulan itu
+        self._produk = {}       # (tahun, bulan, ukuran) -> Series per produk terurut (Top 5 dst.)
+        self._ringkasan = None  # cache ringkasan bulanan, dibuang saat ada perubahan
+        self._terbaik = None    # (tahun, bulan) dengan Jumlah tertinggi, None = hitung ulang
+        self._lock = threading.RLock()
+
+    def punya(self, kunci):
+        return kunci in self._bagian
+
+    def tambah_bulan(self, kunci, df, tahun, bulan):
+        """Agregasi satu file bulanan lalu simpan dengan kunci sumbernya."""
+        self.tambah_agregat(kunci, agregasi_produk(df), tahun, bulan)
+
+    def tambah_agregat(self, kunci, agg, tahun, bulan):
+        """Simpan agregat per produk yang sudah jadi (mis. dari pembaca streaming)."""
+        periode = (int(tahun), int(bulan))
+        with self._lock:
+            if kunci in self._bagian:
+                self._hapus(kunci)
+            self._bagian[kunci] = (*periode, agg)
+            self._per_bulan.setdefault(periode, set()).add(kunci)
+            self._hitung_bulan(periode)
+
+    def _hapus(self, kunci):
+        tahun, bulan, _ = self._bagian.pop(kunci)
+        periode = (tahun, bulan)
+        self._per_bulan[periode].discard(kunci)
+        if not self._per_bulan[periode]:
+            del self._per_bulan[periode]
+        self._hitung_bulan(periode)
+
+    def _hitung_bulan(self, periode):
+        """Hitung ulang total satu bulan dari bagian-bagiannya saja."""
+        for ukuran in KOLOM_UKURAN:
+            self._produk.pop((*periode, ukuran), None)
+        self._ringkasan = None
+        lama = self._total.pop(periode, None)
+        if periode in self._per_bulan:
+            total = {nama: 0 for nama in KOLOM_UKURAN}
+            for kunci in self._per_bulan[periode]:
+                for nama, nilai in self._bagian[kunci][2].sum().items():
+                    total[nama] += nilai
+            self._total[periode] = total
+            # Bulan terbaik cukup dibandingkan dengan bulan yang berubah
+            if self._terbaik is not None and self._terbaik != periode:
+                terbaik = self._total[self._terbaik]['Jumlah']
+                if total['Jumlah'] > terbaik or (total['Jumlah'] == terbaik and periode < self._terbaik):
+                    self._terbaik = periode
+                return
+        # Bulan terbaik lama hilang/berubah: cari ulang saat diminta
+        if lama is not None and self._terbaik == periode:
+            self._terbaik = None
+
+    def pertahankan(self, kunci_aktif):
+        """Buang bagian yang sumbernya sudah tidak ada (mis. file dihapus dari upload)."""
+        with self._lock:
+            for kunci in set(self._bagian) - set(kunci_aktif):
+                self._hapus(kunci)
+
+    def kosong(self):
+        return not self._bagian
+
+    def ringkasan_bulanan(self):
+        """Total per bulan: kolom Tahun, Bulan, Nama_Bulan, Jumlah, Pembeli, Penjualan_IDR."""
+        with self._lock:
+            if self._ringkasan is None:
+                baris = [{'Tahun': tahun, 'Bulan': bulan, **total}
+                         for (tahun, bulan), total in sorted(self._total.items())]
+                summary = pd.DataFrame(baris, columns=['Tahun', 'Bulan', *KOLOM_UKURAN])
+                summary.insert(2, 'Nama_Bulan', summary['Bulan'].map(nama_bulan))
+                self._ringkasan = summary
+            return self._ringkasan
+
+    def bulan_terbaik(self):
+        with self._lock:
+            if self._terbaik is None:
+                # Bulan pertama dengan Jumlah tertinggi (urut kronologis, sama seperti idxmax)
+                self._terbaik = max(sorted(self._total), key=lambda p: self._total[p]['Jumlah'])
+            tahun, bulan = self._terbaik
+            return pd.Series({'Tahun': tahun, 'Bulan': bulan, 'Nama_Bulan': nama_bulan(bulan),
+                              **self._total[self._terbaik]})
+
+    def produk_bulan(self, tahun, bulan, ukuran='Jumlah'):
+        """Total `ukuran` per produk untuk satu bulan, terurut dari terbesar.
+
+        Baris dengan Produk kosong tidak ikut peringkat, tapi tetap ada di
+        total bulan (`ringkasan_bulanan`).
+        """
+        periode = (int(tahun), int(bulan))
+        with self._lock:
+            if (*periode, ukuran) in self._produk:
+                return self._produk[(*periode, ukuran)]
+            bagian = [self._bagian[kunci][2][ukuran] for kunci in self._per_bulan.get(periode, ())]
+            if not bagian:
+                return pd.Series(dtype='int64', name=ukuran)
+            if len(bagian) == 1:
+                total = bagian[0]
+            else:
+                total = gabung_agregat(*bagian)
+            total = total[total.index.notna()]
+            self._produk[(*periode, ukuran)] = total = total.sort_values(ascending=False)
+            return total
+
+
+def sinkron_riwayat(kubus, store):
+    """Samakan kubus dengan dataset tersimpan: hanya partisi baru/berubah yang dibaca.
+
+    Agregat per produk yang tersimpan dipakai langsung; partisi tanpa agregat
+    (mis. disimpan dashboard K-Means) diagregasi sekali lalu agregatnya disimpan.
+    Mengembalikan jumlah baris mentah yang dibaca.
+    """
+    kunci_partisi = {}
+    baris = 0
+    for tahun, bulan in store.daftar_partisi():
+        kunci = store.kunci_partisi(tahun, bulan)
+        kunci_partisi[kunci] = (tahun, bulan)
+        if kubus.punya(kunci):
+            continue
+        agg = store.baca_agregat(tahun, bulan)
+        if agg is None:
+            df_bulan = store.baca_bulan(tahun, bulan)
+            agg = agregasi_produk(df_bulan)
+            store.tulis_agregat(agg, tahun, bulan)
+            baris += len(df_bulan)
+        kubus.tambah_agregat(kunci, agg, tahun, bulan)
+    kubus.pertahankan(kunci_partisi)
+    return baris
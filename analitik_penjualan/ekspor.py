@@ -0,0 +1,92 @@
+# ⬇️ Ekspor hasil (CSV gzip / Parquet / XLSX) secara bertahap
+# Fungsi: Menulis DataFrame hasil per potongan baris langsung ke file
+#         terkompresi, tanpa membentuk seluruh teks CSV di memori. File
+#         hanya dibuat saat tombol download diklik, lalu disimpan di cache
+#         per dataset + status filter supaya klik berikutnya instan.
+
+import gzip
+import io
+import os
+import tempfile
+
+from .cache_bersama import DEFAULT_CACHE_DIR, DEFAULT_TTL, CacheBersama
+
+DEFAULT_CACHE_EKSPOR_MB = int(os.environ.get("DASHBOARD_EXPORT_CACHE_MB", "128"))
+DEFAULT_CHUNK = 100_000
+# Data di atas batas ini ditulis ke file sementara di disk, bukan ke RAM
+BATAS_SPOOL = 16 * 1024 * 1024
+BATAS_BARIS_XLSX = 1_048_575  # 1.048.576 baris per sheet dikurangi header
+
+# format -> (ekstensi file, MIME, label di dashboard)
+FORMAT_EKSPOR = {
+    'csv.gz': ('.csv.gz', 'application/gzip', "CSV (gzip)"),
+    'parquet': ('.parquet', 'application/vnd.apache.parquet', "Parquet"),
+    'xlsx': ('.xlsx', 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet', "Excel (XLSX)"),
+}
+
+
+def _tulis_csv_gz(df, tujuan, chunk):
+    # mtime=0 supaya isi file sama untuk data yang sama
+    with gzip.GzipFile(fileobj=tujuan, mode='wb', compresslevel=6, mtime=0) as gz:
+        with io.TextIOWrapper(gz, encoding='utf-8', newline='') as teks:
+            for awal in range(0, max(len(df), 1), chunk):
+                df.iloc[awal:awal + chunk].to_csv(teks, index=False, header=awal == 0)
+
+
+def _tulis_parquet(df, tujuan, chunk):
+    import pyarrow as pa  # impor tertunda, lihat pemanasan.py
+    import pyarrow.parquet as pq
+
+    # Skema disimpulkan sekali dari seluruh data: kolom object bisa terbaca
+    # bertipe lain di potongan tertentu (mis. potongan yang isinya kosong semua)
+    skema = pa.Schema.from_pandas(df, preserve_index=False)
+    with pq.ParquetWriter(tujuan, skema, compression='zstd') as writer:
+        for awal in range(0, max(len(df), 1), chunk):
+            writer.write_table(pa.Table.from_pandas(df.iloc[awal:awal + chunk], schema=skema, preserve_index=False))
+
+
+def _tulis_xlsx(df, tujuan, chunk):
+    from openpyxl import Workbook  # hanya dibutuhkan untuk XLSX
+
+    if len(df) > BATAS_BARIS_XLSX:
+        raise ValueError(f"XLSX maksimal {BATAS_BARIS_XLSX:,} baris; gunakan CSV (gzip) atau Parquet")
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("Hasil")
+    ws.append([str(k) for k in df.columns])
+    for awal in range(0, len(df), chunk):
+        bagian = df.iloc[awal:awal + chunk].astype(object)
+        for baris in bagian.where(bagian.notna(), None).itertuples(index=False, name=None):
+            ws.append(baris)
+    wb.save(tujuan)
+
+
+_PENULIS = {'csv.gz': _tulis_csv_gz, 'parquet': _tulis_parquet, 'xlsx': _tulis_xlsx}
+
+
+def tulis_ekspor(df, format, tujuan, chunk=DEFAULT_CHUNK):
+    """Tulis `df` ke file-like `tujuan` dalam format `format` (lihat FORMAT_EKSPOR)."""
+    _PENULIS[format](df, tujuan, chunk)
+
+
+def ekspor_bytes(df, format, chunk=DEFAULT_CHUNK):
+    """Hasil ekspor sebagai bytes; selama penulisan data besar ditampung di disk."""
+    with tempfile.SpooledTemporaryFile(max_size=BATAS_SPOOL) as tmp:
+        tulis_ekspor(df, format, tmp, chunk)
+        tmp.seek(0)
+        return tmp.read()
+
+
+class CacheEkspor:
+    """Cache file ekspor (sudah terkompresi) per kunci status filter, dipakai bersama semua sesi.
+
+    Beberapa sesi yang mengklik unduhan yang sama bersamaan hanya menulis file sekali.
+    """
+
+    def __init__(self, max_bytes=DEFAULT_CACHE_EKSPOR_MB * 1024 * 1024, ttl=DEFAULT_TTL, folder=DEFAULT_CACHE_DIR):
+        self._cache = CacheBersama("ekspor", max_bytes, ttl=ttl, folder=folder)
+
+    def ambil(self, kunci, df, format, chunk=DEFAULT_CHUNK):
+        return self._cache.ambil((kunci, format), lambda: ekspor_bytes(df, format, chunk))
+
+    def statistik(self):
+        return self._cache.statistik()
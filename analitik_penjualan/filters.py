@@ -0,0 +1,120 @@
+# 🔎 Mesin filter berbasis indeks
+# Fungsi: Menyiapkan indeks terurut untuk kolom rentang (slider) dan bitmap
+#         posisi baris untuk kolom keanggotaan (multiselect) sekali per
+#         dataset. Query rentang dijawab dengan binary search (searchsorted),
+#         lalu kandidat terkecil dicek ke filter lain, jadi biaya per rerun
+#         mengikuti jumlah baris yang lolos, bukan jumlah baris total.
+
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+
+class IndeksFilter:
+    def __init__(self, df, kolom_rentang=(), kolom_anggota=()):
+        self.n = len(df)
+        self._nilai = {}     # kolom rentang -> nilai asli (urutan baris)
+        self._urutan = {}    # kolom rentang -> posisi baris terurut menurut nilai
+        self._terurut = {}   # kolom rentang -> nilai terurut
+        self._n_valid = {}   # kolom rentang -> jumlah nilai non-NaN (NaN terurut di akhir)
+        self._bitmap = {}    # kolom anggota -> {nilai: bitmap bool per baris}
+        for kolom in kolom_rentang:
+            nilai = df[kolom].to_numpy(dtype=np.float64)
+            urutan = np.argsort(nilai, kind='stable')
+            self._nilai[kolom] = nilai
+            self._urutan[kolom] = urutan
+            self._terurut[kolom] = nilai[urutan]
+            self._n_valid[kolom] = int(np.count_nonzero(~np.isnan(nilai)))
+        for kolom in kolom_anggota:
+            kode, unik = pd.factorize(df[kolom])
+            self._bitmap[kolom] = {v: kode == i for i, v in enumerate(unik)}
+
+    def batas(self, kolom):
+        """(min, max) kolom rentang, O(1) dari indeks terurut (NaN diabaikan)."""
+        terurut, n_valid = self._terurut[kolom], self._n_valid[kolom]
+        return (terurut[0], terurut[n_valid - 1]) if n_valid else (np.nan, np.nan)
+
+    def nilai_unik(self, kolom):
+        return list(self._bitmap[kolom])
+
+    def ukuran_bytes(self):
+        """Perkiraan memori indeks (array nilai, urutan, dan bitmap)."""
+        total = sum(a.nbytes for d in (self._nilai, self._urutan, self._terurut) for a in d.values())
+        return total + sum(b.nbytes for bitmap in self._bitmap.values() for b in bitmap.values())
+
+    def _posisi_rentang(self, kolom, bawah, atas):
+        """Posisi baris dengan bawah <= nilai <= atas, atau None jika semua baris lolos."""
+        terurut = self._terurut[kolom]
+        kiri = np.searchsorted(terurut, bawah, side='left')
+        kanan = np.searchsorted(terurut, atas, side='right')
+        if kiri == 0 and kanan == self.n:
+            return None
+        return np.sort(self._urutan[kolom][kiri:kanan])
+
+    def _bitmap_anggota(self, kolom, pilihan):
+        """Gabungan (OR) bitmap untuk nilai terpilih, atau None jika semua nilai dipilih."""
+        bitmap = self._bitmap[kolom]
+        pilihan = set(pilihan)
+        if pilihan.issuperset(bitmap):
+            return None
+        hasil = np.zeros(self.n, dtype=bool)
+        for nilai in pilihan & set(bitmap):
+            hasil |= bitmap[nilai]
+        return hasil
+
+    def cari(self, anggota=None, rentang=None):
+        """Posisi baris (terurut) yang lolos semua filter, atau None jika tidak ada yang tersaring.
+
+        `anggota` = {kolom: nilai terpilih}, `rentang` = {kolom: (bawah, atas)}.
+        """
+        bitmaps = [b for b in (self._bitmap_anggota(k, v) for k, v in (anggota or {}).items()) if b is not None]
+        rentang_aktif = []
+        kandidat = None
+        for kolom, (bawah, atas) in (rentang or {}).items():
+            posisi = self._posisi_rentang(kolom, bawah, atas)
+            if posisi is None:
+                continue
+            rentang_aktif.append((kolom, bawah, atas, posisi))
+
+        if rentang_aktif:
+            # Mulai dari rentang paling selektif, lalu cek kandidatnya saja
+            rentang_aktif.sort(key=lambda r: len(r[3]))
+            kandidat = rentang_aktif[0][3]
+            for kolom, bawah, atas, _ in rentang_aktif[1:]:
+                nilai = self._nilai[kolom][kandidat]
+                kandidat = kandidat[(nilai >= bawah) & (nilai <= atas)]
+            for bitmap in bitmaps:
+                kandidat = kandidat[bitmap[kandidat]]
+            return kandidat
+
+        if bitmaps:
+            gabungan = bitmaps[0].copy()
+            for bitmap in bitmaps[1:]:
+                gabungan &= bitmap
+            return np.flatnonzero(gabungan)
+        return None
+
+
+class CacheIndeks:
+    """Cache IndeksFilter per dataset, supaya indeks dibangun sekali saja."""
+
+    def __init__(self, max_entri=16):
+        self.max_entri = max_entri
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def ambil(self, kunci, df, kolom_rentang=(), kolom_anggota=()):
+        kunci = (kunci, tuple(kolom_rentang), tuple(kolom_anggota))
+        with self._lock:
+            if kunci in self._data:
+                self._data.move_to_end(kunci)
+                return self._data[kunci]
+
+        indeks = IndeksFilter(df, kolom_rentang, kolom_anggota)
+        with self._lock:
+            self._data[kunci] = indeks
+            while len(self._data) > self.max_entri:
+                self._data.popitem(last=False)
+        return indeks
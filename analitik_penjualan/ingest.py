@@ -0,0 +1,243 @@
+# 📥 Lapisan baca CSV ber-cache + pipeline file bulanan
+# Fungsi: Menyimpan hasil parsing CSV di memori dengan kunci hash isi file
+#         + opsi parsing, supaya rerun Streamlit (geser slider, ganti filter)
+#         maupun sesi lain tidak mem-parsing ulang file yang sama.
+#         Untuk dashboard bulanan: membaca, memvalidasi, dan menambah kolom
+#         waktu setiap file CSV bulanan di thread/process pool. Pesan
+#         validasi dikumpulkan per file lalu ditampilkan sesuai urutan upload.
+
+import hashlib
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from io import BytesIO
+
+import pandas as pd
+
+from .cache_bersama import DEFAULT_CACHE_DIR, DEFAULT_TTL, CacheBersama, ukuran_objek
+from .cube import KOLOM_UKURAN, agregasi_produk, gabung_agregat
+from .periode import nama_bulan, parse_nama_file
+from .schema import angka, kolom_hilang, laporan_memori, terapkan_skema
+
+# Batas memori cache (MB), bisa diatur lewat environment variable
+DEFAULT_CACHE_MB = int(os.environ.get("DASHBOARD_CACHE_MB", "512"))
+ENCODING = 'ISO-8859-1'
+DEFAULT_CHUNK = 200_000
+_BLOK_HASH = 1024 * 1024
+
+
+def hash_konten(data, **opsi):
+    """Kunci cache: SHA-256 dari isi file + opsi parsing yang dipakai."""
+    h = hashlib.sha256(data)
+    h.update(repr(sorted(opsi.items())).encode("utf-8"))
+    return h.hexdigest()
+
+
+class CacheCSV:
+    """Cache LRU untuk DataFrame hasil parsing, dibatasi total byte.
+
+    Disimpan di CacheBersama: dipakai semua sesi, satu file yang di-upload
+    beberapa analis bersamaan hanya di-parse sekali, dan entri kedaluwarsa
+    setelah TTL (opsional juga disimpan di disk).
+    """
+
+    def __init__(self, max_bytes=DEFAULT_CACHE_MB * 1024 * 1024, skema=True, ttl=DEFAULT_TTL, folder=DEFAULT_CACHE_DIR):
+        self.max_bytes = max_bytes
+        self.skema = skema
+        # nilai = (DataFrame, ukuran sebelum skema diterapkan)
+        self._cache = CacheBersama("csv", max_bytes, ttl=ttl, folder=folder,
+                                   ukuran=lambda nilai: ukuran_objek(nilai[0]))
+
+    def baca(self, data, **opsi):
+        """Kembalikan DataFrame untuk isi file `data` (bytes).
+
+        Hasil yang dikembalikan selalu salinan, jadi dashboard bebas
+        menambah kolom tanpa merusak isi cache.
+        """
+        return self.baca_dengan_kunci(data, **opsi)[1]
+
+    def kunci(self, data, **opsi):
+        """Hash dataset tanpa membaca/parsing isinya."""
+        return hash_konten(data, skema=self.skema, **opsi)
+
+    def baca_dengan_kunci(self, data, **opsi):
+        """Sama seperti `baca`, tapi juga mengembalikan hash dataset.
+
+        Hash ini dipakai tahap berikutnya (mis. clustering) sebagai kunci.
+        """
+        kunci = self.kunci(data, **opsi)
+        df, _ = self._cache.ambil(kunci, lambda: self._parse(data, opsi))
+        return kunci, df.copy()
+
+    def _parse(self, data, opsi):
+        df = pd.read_csv(BytesIO(data), **opsi)
+        ukuran_mentah = int(df.memory_usage(deep=True).sum())
+        if self.skema:
+            df = terapkan_skema(df)
+        return df, ukuran_mentah
+
+    def statistik(self):
+        stat = self._cache.statistik()
+        stat["ukuran_mentah_mb"] = sum(mentah for _, mentah in self._cache.nilai()) / (1024 * 1024)
+        return stat
+
+
+def _buka(data):
+    """Bytes -> BytesIO; file-like (mis. UploadedFile) dikembalikan dari awal."""
+    if isinstance(data, (bytes, bytearray)):
+        return BytesIO(data)
+    if hasattr(data, 'seek'):
+        data.seek(0)
+    return data
+
+
+def kunci_file(file_name, data):
+    """Kunci sumber untuk satu file: hash nama (bulan/tahun) + isi file.
+
+    `data` boleh bytes atau file-like; file-like di-hash per blok.
+    """
+    h = hashlib.sha256(file_name.encode("utf-8"))
+    if isinstance(data, (bytes, bytearray)):
+        h.update(data)
+    else:
+        f = _buka(data)
+        for blok in iter(lambda: f.read(_BLOK_HASH), b""):
+            h.update(blok)
+    return h.hexdigest()
+
+
+def proses_file(file_name, data):
+    """Proses satu file bulanan.
+
+    Mengembalikan (pesan, df). `pesan` adalah list (jenis, argumen...) yang
+    nanti dirender dengan `getattr(st, jenis)(*argumen)` di thread utama,
+    karena elemen Streamlit tidak boleh dibuat dari worker. `df` bernilai
+    None jika file tidak valid.
+    """
+    pesan = []
+    try:
+        df = pd.read_csv(_buka(data), encoding=ENCODING)
+
+        # Menampilkan jumlah baris & kolom
+        pesan.append(('write', f"Jumlah baris: {len(df)}"))
+        pesan.append(('write', "Kolom ditemukan:", list(df.columns)))
+
+        # Validasi kolom penting
+        if kolom_hilang(df.columns):
+            pesan.append(('error', "❌ Kolom 'Produk (Pesanan Dibuat)' atau 'Produk' TIDAK DITEMUKAN"))
+            return pesan, None
+        elif df.empty or df['Produk (Pesanan Dibuat)'].dropna().empty:
+            pesan.append(('warning', "⚠️ File ini kosong atau tidak ada data penjualan"))
+            return pesan, None
+        else:
+            pesan.append(('success', "✅ Struktur file valid"))
+
+        # Ekstrak bulan & tahun dari nama file
+        periode = parse_nama_file(file_name)
+        if periode:
+            tahun, bulan = periode
+        else:
+            pesan.append(('warning', f"❌ Nama file tidak dikenali: {file_name}"))
+            return pesan, None
+
+        # Konversi jumlah produk ke integer
+        df['Jumlah'] = angka(df['Produk (Pesanan Dibuat)']).astype(int)
+
+        # Tambahkan kolom informasi waktu
+        df['Bulan'] = bulan
+        df['Tahun'] = tahun
+        df['Nama_Bulan'] = nama_bulan(bulan)
+
+        # Tipe data ringkas (category, integer kecil, IDR fixed-point)
+        df_ringkas = terapkan_skema(df)
+        memori = laporan_memori(df, df_ringkas)
+        pesan.append(('caption', f"Memori: {memori['sebelum_mb']:.2f} MB → {memori['sesudah_mb']:.2f} MB "
+                                 f"(hemat {memori['hemat_persen']:.0f}%)"))
+
+        return pesan, df_ringkas
+
+    except Exception as e:
+        pesan.append(('error', f"❌ Gagal membaca file: {e}"))
+        return pesan, None
+
+
+def proses_file_stream(file_name, data, chunksize=DEFAULT_CHUNK):
+    """Proses satu file bulanan tanpa memuat seluruh isinya.
+
+    Header divalidasi dari baris pertama sehingga file yang salah langsung
+    ditolak; isi file lalu dibaca per `chunksize` baris dan dilipat ke
+    total per produk. Memori puncak sebanding dengan ukuran chunk + jumlah
+    produk, bukan jumlah baris.
+
+    Mengembalikan (pesan, hasil) dengan `hasil` = (tahun, bulan, agregat
+    per produk) atau None jika file tidak valid.
+    """
+    pesan = []
+    try:
+        kolom = list(pd.read_csv(_buka(data), encoding=ENCODING, nrows=0).columns)
+        pesan.append(('write', "Kolom ditemukan:", kolom))
+        if kolom_hilang(kolom):
+            pesan.append(('error', "❌ Kolom 'Produk (Pesanan Dibuat)' atau 'Produk' TIDAK DITEMUKAN"))
+            return pesan, None
+
+        periode = parse_nama_file(file_name)
+        if not periode:
+            pesan.append(('warning', f"❌ Nama file tidak dikenali: {file_name}"))
+            return pesan, None
+        tahun, bulan = periode
+
+        # Hanya kolom yang dipakai agregasi yang dibaca
+        dipakai = [k for k in kolom if k == 'Produk' or k in KOLOM_UKURAN.values()]
+        total, jumlah_baris, ada_penjualan = None, 0, False
+        for chunk in pd.read_csv(_buka(data), encoding=ENCODING, usecols=dipakai, chunksize=chunksize):
+            jumlah_baris += len(chunk)
+            ada_penjualan = ada_penjualan or chunk['Produk (Pesanan Dibuat)'].notna().any()
+            agg = agregasi_produk(chunk)
+            total = agg if total is None else gabung_agregat(total, agg)
+
+        pesan.append(('write', f"Jumlah baris: {jumlah_baris}"))
+        if not ada_penjualan:
+            pesan.append(('warning', "⚠️ File ini kosong atau tidak ada data penjualan"))
+            return pesan, None
+        pesan.append(('success', "✅ Struktur file valid"))
+        return pesan, (tahun, bulan, total)
+
+    except Exception as e:
+        pesan.append(('error', f"❌ Gagal membaca file: {e}"))
+        return pesan, None
+
+
+def cache_ingest(max_bytes=DEFAULT_CACHE_MB * 1024 * 1024, **opsi):
+    """Cache bersama hasil `proses_file`/`proses_file_stream` per (kunci file, fungsi)."""
+    return CacheBersama("ingest", max_bytes, **opsi)
+
+
+def _proses_bersama(cache, fungsi, file_name, data, kunci):
+    return cache.ambil((kunci, fungsi.__name__), lambda: fungsi(file_name, data))
+
+
+def proses_paralel(files, max_workers=None, pakai_proses=False, fungsi=proses_file, cache=None, kunci=None):
+    """Proses banyak file sekaligus.
+
+    `files` berisi pasangan (nama_file, bytes atau file-like). Hasilnya list
+    (nama_file, pesan, hasil) dengan urutan yang sama seperti input, apa pun
+    urutan selesainya worker. `fungsi` adalah `proses_file` (default) atau
+    `proses_file_stream`.
+
+    Jika `cache` (dari `cache_ingest()`) diberikan, hasil dibagi antar sesi:
+    file yang sedang di-parse sesi lain cukup ditunggu. `kunci` boleh berisi
+    hasil `kunci_file` yang sudah dihitung, sesuai urutan `files`. Cache hanya
+    dipakai di mode thread; hasilnya dipakai bersama, jangan diubah.
+    """
+    files = list(files)
+    if not files:
+        return []
+    max_workers = max_workers or min(len(files), os.cpu_count() or 1)
+    argumen = [[nama for nama, _ in files], [data for _, data in files]]
+    if cache is not None and not pakai_proses:
+        argumen.append(list(kunci) if kunci is not None else [kunci_file(nama, data) for nama, data in files])
+        fungsi = partial(_proses_bersama, cache, fungsi)
+    pool_cls = ProcessPoolExecutor if pakai_proses else ThreadPoolExecutor
+    with pool_cls(max_workers=max_workers) as pool:
+        hasil = pool.map(fungsi, *argumen)
+        return [(nama, pesan, df) for (nama, _), (pesan, df) in zip(files, hasil)]
@@ -0,0 +1,97 @@
+# 🐞 Instrumentasi per tahap pipeline
+# Fungsi: Mencatat wall time, CPU time, puncak alokasi memori, dan jumlah
+#         baris untuk setiap tahap (baca CSV, K-Means, filter, grafik,
+#         ekspor, ...). Hasilnya ditulis sebagai log terstruktur (JSON) dan
+#         bisa ditampilkan di panel debug sidebar. Tahap yang melewati
+#         budget latensi ditandai.
+
+import json
+import logging
+import os
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+import pandas as pd
+
+DEFAULT_BUDGET_MS = float(os.environ.get("DASHBOARD_BUDGET_MS", "500"))
+
+# Modul inti hanya mengambil logger; handler dipasang oleh script (lihat atur_logging)
+logger = logging.getLogger("dashboard_penjualan.perf")
+
+
+def atur_logging(level=logging.INFO):
+    """Tulis log performa ke stderr. Dipanggil script Streamlit/CLI, bukan saat modul diimpor.
+
+    Aman dipanggil di setiap rerun: handler hanya dipasang sekali.
+    """
+    if not logger.handlers:
+        handler = logging.StreamHandler()
+        handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s %(message)s"))
+        logger.addHandler(handler)
+        logger.propagate = False
+    logger.setLevel(level)
+
+
+class Instrumentasi:
+    """Pencatat tahap untuk satu kali jalan (satu rerun dashboard / satu file batch).
+
+    `lacak_memori` menyalakan tracemalloc, yang menambah overhead cukup besar;
+    aktifkan hanya saat panel debug dibuka. tracemalloc berlaku untuk seluruh
+    proses, jadi puncak memori bisa ikut terpengaruh sesi lain yang berjalan
+    bersamaan. CPU time juga dihitung per proses (termasuk thread OpenMP
+    milik K-Means).
+    """
+
+    def __init__(self, nama_app, budget_ms=DEFAULT_BUDGET_MS, budget_tahap=None,
+                 lacak_memori=False, log=True):
+        self.nama_app = nama_app
+        self.budget_ms = budget_ms
+        self.budget_tahap = budget_tahap or {}
+        self.lacak_memori = lacak_memori
+        self.log = log
+        self.catatan = []
+
+    @contextmanager
+    def tahap(self, nama, baris=None):
+        """Ukur blok `with`. Isi `catatan['baris']` di dalam blok jika jumlah baris baru diketahui."""
+        catatan = {'app': self.nama_app, 'tahap': nama, 'baris': baris}
+        mulai_tracemalloc = False
+        if self.lacak_memori:
+            if tracemalloc.is_tracing():
+                tracemalloc.reset_peak()
+            else:
+                tracemalloc.start()
+                mulai_tracemalloc = True
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            yield catatan
+        finally:
+            catatan['wall_ms'] = round((time.perf_counter() - wall) * 1000, 3)
+            catatan['cpu_ms'] = round((time.process_time() - cpu) * 1000, 3)
+            catatan['peak_mb'] = None
+            if self.lacak_memori:
+                catatan['peak_mb'] = round(tracemalloc.get_traced_memory()[1] / (1024 * 1024), 3)
+                if mulai_tracemalloc:
+                    tracemalloc.stop()
+            budget = self.budget_tahap.get(nama, self.budget_ms)
+            catatan['lambat'] = catatan['wall_ms'] > budget
+            self.catatan.append(catatan)
+            if self.log:
+                logger.log(logging.WARNING if catatan['lambat'] else logging.INFO,
+                           json.dumps(catatan, ensure_ascii=False, default=str))
+
+    def tabel(self):
+        kolom = ['tahap', 'wall_ms', 'cpu_ms', 'peak_mb', 'baris', 'lambat']
+        return pd.DataFrame(self.catatan, columns=['app'] + kolom)[kolom]
+
+    def total_ms(self):
+        return sum(c['wall_ms'] for c in self.catatan)
+
+    def tampilkan(self, wadah):
+        """Tampilkan tabel tahap di `wadah` Streamlit (mis. expander di sidebar)."""
+        wadah.caption(f"Total {self.total_ms():.0f} ms • budget {self.budget_ms:.0f} ms per tahap")
+        wadah.dataframe(self.tabel().round(2), hide_index=True)
+        for c in self.catatan:
+            if c['lambat']:
+                wadah.warning(f"⏱️ {c['tahap']}: {c['wall_ms']:.0f} ms")
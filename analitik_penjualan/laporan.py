@@ -0,0 +1,172 @@
+# 🖨️ Laporan batch tanpa Streamlit (CLI)
+# Fungsi: Menjalankan pipeline yang sama dengan dashboard
+#         (baca CSV -> clustering -> rekomendasi -> ringkasan) untuk semua
+#         file bulan_<M>_<YYYY>.csv di satu folder, paralel per file, lalu
+#         menulis hasil CSV, Parquet, dan grafik PNG.
+#
+# Contoh:
+#   python -m analitik_penjualan.laporan data_toko/ laporan_toko/ --workers 8
+#   python -m analitik_penjualan.laporan data_toko/ laporan_toko/ --tanpa-cluster --engine minibatch
+
+import argparse
+import glob
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+from threadpoolctl import threadpool_limits
+
+from .aturan import terapkan_catatan, terapkan_strategi
+from .charts import (CacheGrafik, gambar_kontribusi, gambar_penjualan_bulanan,
+                    gambar_pie_kategori, gambar_top5, gambar_top_produk)
+from .clustering import DEFAULT_ENGINE, ENGINE, fit_kategori
+from .periode import nama_bulan, parse_nama_file, tambah_periode
+from .schema import KOLOM_KATEGORI, tambah_juta, terapkan_skema
+
+FORMAT = ('csv', 'parquet', 'png')
+
+
+def siapkan_dataset(df, engine=DEFAULT_ENGINE):
+    """Tambah kolom turunan dashboard: Total Penjualan (Juta), Cluster, Kategori, Rekomendasi."""
+    tambah_juta(df)
+    hasil_cluster = fit_kategori(df, engine=engine)
+    df['Cluster'] = hasil_cluster.labels
+    df['Kategori'] = df['Cluster'].map(hasil_cluster.label_map).astype(KOLOM_KATEGORI['Kategori'])
+    df['Rekomendasi Strategi'] = terapkan_strategi(df['Kategori'])
+    return df
+
+
+def proses_file(path, folder_output, engine=DEFAULT_ENGINE, format=FORMAT, tanpa_cluster=False, satu_thread=False):
+    """Proses satu file dan tulis hasilnya. Mengembalikan ringkasan kecil untuk digabung."""
+    nama = os.path.basename(path)
+    stem = nama.replace('.csv', '')
+    with threadpool_limits(1 if satu_thread else None):
+        df = siapkan_dataset(terapkan_skema(pd.read_csv(path)), engine)
+
+    # Kolom Tahun & Bulan seperti file unduhan di dashboard
+    tahun, bulan = parse_nama_file(nama)
+    tambah_periode(df, nama)
+
+    hasil = df.drop(columns=['Cluster', 'Distance_to_Centroid'], errors='ignore') if tanpa_cluster else df
+    if 'csv' in format:
+        hasil.to_csv(os.path.join(folder_output, f"hasil_{stem}_dengan_strategi.csv"), index=False)
+    if 'parquet' in format:
+        hasil.to_parquet(os.path.join(folder_output, f"hasil_{stem}_dengan_strategi.parquet"), index=False)
+
+    kategori_counts = df['Kategori'].value_counts()
+    kategori_counts = kategori_counts[kategori_counts > 0]
+    kontribusi = df.groupby('Kategori', observed=True)['Total Penjualan (Juta)'].sum().sort_values(ascending=False)
+    if 'png' in format:
+        grafik = CacheGrafik(max_bytes=0)  # hanya render, tidak perlu cache di proses batch
+        folder_grafik = os.path.join(folder_output, "grafik")
+        top_produk = df.sort_values(by='Produk (Pesanan Dibuat)', ascending=False).head(10)
+        for akhiran, png in [
+            ("top_produk", grafik.render("top_produk", top_produk[['Produk', 'Produk (Pesanan Dibuat)']].astype({'Produk': str}),
+                                         gambar_top_produk, figsize=(6, 4))),
+            ("kategori", grafik.render("pie_kategori", kategori_counts, gambar_pie_kategori, figsize=(6.4, 4.8))),
+            ("kontribusi", grafik.render("kontribusi", kontribusi, gambar_kontribusi, figsize=(6, 4))),
+        ]:
+            with open(os.path.join(folder_grafik, f"{stem}_{akhiran}.png"), "wb") as f:
+                f.write(png)
+
+    # Ringkasan per kategori & per produk untuk laporan gabungan
+    per_kategori = df.groupby('Kategori', observed=True).agg(
+        Jumlah_Produk=('Produk', 'size'),
+        Jumlah=('Produk (Pesanan Dibuat)', 'sum'),
+        Pembeli=('Total Pembeli (Pesanan Dibuat)', 'sum'),
+        Penjualan_IDR=('Total Penjualan (Pesanan Dibuat) (IDR)', 'sum'),
+    ).reset_index()
+    per_kategori.insert(0, 'File', nama)
+    per_kategori.insert(1, 'Tahun', tahun)
+    per_kategori.insert(2, 'Bulan', bulan)
+    per_produk = df.groupby('Produk', observed=True)['Produk (Pesanan Dibuat)'].sum()
+    return nama, tahun, bulan, per_kategori, per_produk
+
+
+def tulis_ringkasan(hasil, folder_output, format=FORMAT):
+    """Laporan gabungan semua file: ringkasan bulanan, kategori, dan Top 5 per bulan."""
+    per_kategori = pd.concat([h[3] for h in hasil], ignore_index=True)
+    summary = (per_kategori.groupby(['Tahun', 'Bulan'], as_index=False)[['Jumlah', 'Pembeli', 'Penjualan_IDR']]
+               .sum().sort_values(['Tahun', 'Bulan']))
+    summary.insert(2, 'Nama_Bulan', summary['Bulan'].map(nama_bulan))
+
+    top5 = []
+    for nama, tahun, bulan, _, per_produk in hasil:
+        produk = per_produk.sort_values(ascending=False)
+        teratas = produk.head(5)
+        top5.append(pd.DataFrame({
+            'File': nama, 'Tahun': tahun, 'Bulan': bulan,
+            'Produk': teratas.index.astype(str),
+            'Jumlah Pesanan': teratas.values,
+            'Persentase': (teratas / produk.sum() * 100).round(1).values,
+        }))
+    top5 = pd.concat(top5, ignore_index=True)
+    top5['Catatan'] = terapkan_catatan(top5['Produk'])
+
+    for nama_tabel, tabel in [("ringkasan_bulanan", summary), ("ringkasan_kategori", per_kategori), ("top5_per_bulan", top5)]:
+        if 'csv' in format:
+            tabel.to_csv(os.path.join(folder_output, f"{nama_tabel}.csv"), index=False)
+        if 'parquet' in format:
+            tabel.to_parquet(os.path.join(folder_output, f"{nama_tabel}.parquet"), index=False)
+
+    if 'png' in format:
+        grafik = CacheGrafik(max_bytes=0)
+        folder_grafik = os.path.join(folder_output, "grafik")
+        with open(os.path.join(folder_grafik, "penjualan_bulanan.png"), "wb") as f:
+            f.write(grafik.render("penjualan_bulanan", summary[['Nama_Bulan', 'Jumlah', 'Tahun']],
+                                  gambar_penjualan_bulanan, figsize=(12, 6)))
+        for (nama, tahun, bulan), bagian in top5.groupby(['File', 'Tahun', 'Bulan'], sort=False):
+            data_top5 = bagian.set_index('Produk')[['Jumlah Pesanan', 'Persentase']].rename(
+                columns={'Jumlah Pesanan': 'Jumlah'})[::-1]
+            judul = f"Kategori Produk Paling Laris - {nama_bulan(bulan)} {tahun}"
+            with open(os.path.join(folder_grafik, f"{nama.replace('.csv', '')}_top5.png"), "wb") as f:
+                f.write(grafik.render("top5", data_top5, gambar_top5, figsize=(12, 6), judul=judul))
+    return summary
+
+
+def jalankan(folder_input, folder_output, workers=None, engine=DEFAULT_ENGINE, format=FORMAT, tanpa_cluster=False):
+    files = sorted(p for p in glob.glob(os.path.join(folder_input, "*.csv"))
+                   if parse_nama_file(os.path.basename(p)))
+    if not files:
+        raise SystemExit(f"Tidak ada file bulan_<M>_<YYYY>.csv di {folder_input}")
+    os.makedirs(os.path.join(folder_output, "grafik"), exist_ok=True)
+
+    workers = workers or min(len(files), os.cpu_count() or 1)
+    # Dengan banyak proses, tiap proses cukup 1 thread BLAS/OpenMP supaya core tidak rebutan
+    satu_thread = workers > 1
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(proses_file, path, folder_output, engine, format, tanpa_cluster, satu_thread)
+                   for path in files]
+        hasil = []
+        for path, future in zip(files, futures):
+            try:
+                hasil.append(future.result())
+                print(f"✅ {os.path.basename(path)}")
+            except Exception as e:
+                print(f"❌ {os.path.basename(path)}: {e}", file=sys.stderr)
+
+    if hasil:
+        tulis_ringkasan(hasil, folder_output, format)
+    return len(hasil), len(files)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Laporan penjualan batch tanpa Streamlit")
+    parser.add_argument("folder_input", help="folder berisi bulan_<M>_<YYYY>.csv")
+    parser.add_argument("folder_output", help="folder tujuan laporan")
+    parser.add_argument("--workers", type=int, default=None, help="jumlah proses paralel (default: jumlah core)")
+    parser.add_argument("--engine", choices=ENGINE, default=DEFAULT_ENGINE, help="mesin clustering")
+    parser.add_argument("--format", nargs="+", choices=FORMAT, default=list(FORMAT), help="jenis output")
+    parser.add_argument("--tanpa-cluster", action="store_true",
+                        help="hapus kolom Cluster & Distance_to_Centroid dari file hasil")
+    args = parser.parse_args(argv)
+
+    berhasil, total = jalankan(args.folder_input, args.folder_output, args.workers,
+                               args.engine, args.format, args.tanpa_cluster)
+    print(f"Selesai: {berhasil}/{total} file diproses → {args.folder_output}")
+    return 0 if berhasil == total else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
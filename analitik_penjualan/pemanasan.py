@@ -0,0 +1,70 @@
+# 🔥 Impor modul berat secara tertunda + pemanasan di latar belakang
+# Fungsi: sklearn, seaborn, matplotlib, dan pyarrow.parquet tidak diimpor di awal script;
+#         modul tersebut baru diimpor saat tahap yang membutuhkannya
+#         (clustering, render grafik) pertama kali berjalan. `panaskan()`
+#         mengimpor semuanya di satu thread latar belakang, sekali per
+#         proses, supaya halaman awal langsung tampil dan modul sudah siap
+#         saat file pertama diupload. Waktu impor tiap modul dicatat.
+
+import importlib
+import os
+import sys
+import threading
+
+from .instrumentasi import Instrumentasi
+
+# Modul yang impor pertamanya mahal (puluhan ms sampai > 1 detik)
+MODUL_BERAT = ('matplotlib.pyplot', 'seaborn', 'sklearn.cluster', 'sklearn.metrics', 'pyarrow.parquet')
+# DASHBOARD_WARMUP=0 mematikan pemanasan (modul hanya diimpor saat dibutuhkan)
+PEMANASAN_AKTIF = os.environ.get("DASHBOARD_WARMUP", "1") != "0"
+
+_instr = Instrumentasi("pemanasan")
+_thread = None
+_lock = threading.Lock()
+
+
+def _impor_semua(modul):
+    for nama in modul:
+        if nama in sys.modules:
+            continue
+        try:
+            with _instr.tahap(f"impor_{nama}"):
+                importlib.import_module(nama)
+        except ImportError:
+            # Biarkan tahap yang membutuhkan modul ini yang menampilkan error-nya
+            continue
+
+
+def panaskan(modul=MODUL_BERAT):
+    """Mulai impor `modul` di thread latar belakang (hanya sekali per proses).
+
+    Aman dipanggil di setiap rerun Streamlit. Jika sebuah tahap membutuhkan
+    modul yang sedang diimpor, tahap itu cukup menunggu impor yang sama
+    selesai (importlib mengunci per modul).
+    """
+    global _thread
+    if not PEMANASAN_AKTIF:
+        return None
+    with _lock:
+        if _thread is None:
+            _thread = threading.Thread(target=_impor_semua, args=(tuple(modul),),
+                                       name="pemanasan", daemon=True)
+            _thread.start()
+    return _thread
+
+
+def tunggu_pemanasan(timeout=None):
+    """Tunggu pemanasan selesai; True jika selesai dalam `timeout` detik."""
+    if _thread is not None:
+        _thread.join(timeout)
+    return pemanasan_selesai()
+
+
+def pemanasan_selesai():
+    """True jika pemanasan sudah selesai (atau belum pernah dimulai)."""
+    return _thread is None or not _thread.is_alive()
+
+
+def tabel_impor():
+    """Waktu impor per modul yang dipanaskan (lihat Instrumentasi.tabel)."""
+    return _instr.tabel()
@@ -0,0 +1,123 @@
+# 📈 Perbandingan antar bulan
+# Fungsi: Menggabungkan semua file bulanan, meng-cluster semuanya sekaligus
+#         (supaya tier Kurang Laris/Laris/Sangat Laris sebanding antar bulan),
+#         lalu membentuk matriks produk × bulan (nilai & tier) dengan satu
+#         pivot berbasis kode (bincount), bukan loop per file. Dari matriks
+#         itu dihitung pertumbuhan bulan-ke-bulan dan perpindahan tier produk.
+
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from .periode import label_periode
+from .schema import KOLOM_JUTA, KOLOM_KATEGORI, tambah_juta, terapkan_skema
+
+UKURAN_DEFAULT = KOLOM_JUTA
+
+
+def gabung_bulan(bagian):
+    """Satu DataFrame dari [(tahun, bulan, df)], dengan kolom Tahun, Bulan, dan Total Penjualan (Juta)."""
+    df = pd.concat(
+        [d.assign(Tahun=tahun, Bulan=bulan) for tahun, bulan, d in bagian],
+        ignore_index=True,
+    )
+    df['Produk'] = df['Produk'].astype(object)  # kategori Produk per file berbeda; disatukan ulang oleh skema
+    df = terapkan_skema(df)
+    tambah_juta(df)
+    return df
+
+
+@dataclass(frozen=True)
+class HasilPerbandingan:
+    periode: list          # [(tahun, bulan)] terurut
+    produk: pd.Index       # label baris matriks
+    nilai: np.ndarray      # produk × periode, total `ukuran` (0 jika tidak terjual)
+    tier: np.ndarray       # produk × periode, kode Kategori (-1 jika produk tidak ada di bulan itu)
+    ukuran: str
+    kategori: list         # label tier berurutan (kode Kategori -> label)
+
+    def label(self):
+        return [label_periode(t, b) for t, b in self.periode]
+
+    def pertumbuhan_bulanan(self):
+        """Total per bulan & per tier, plus pertumbuhan (%) dibanding bulan sebelumnya."""
+        m, k = len(self.periode), len(self.kategori)
+        ada = self.tier >= 0
+        kolom = np.broadcast_to(np.arange(m), self.tier.shape)[ada]
+        per_tier = np.bincount(kolom * k + self.tier[ada], weights=self.nilai[ada], minlength=m * k).reshape(m, k)
+        hasil = pd.DataFrame(per_tier, columns=self.kategori, index=pd.Index(self.label(), name='Periode'))
+        hasil.insert(0, 'Total', hasil.sum(axis=1))
+        hasil.insert(1, 'Pertumbuhan (%)', (hasil['Total'].pct_change() * 100).round(1))
+        hasil.insert(2, 'Jumlah Produk', ada.sum(axis=0))
+        return hasil
+
+    def transisi_tier(self):
+        """Jumlah perpindahan tier (dari × ke) untuk semua pasangan bulan berurutan."""
+        k = len(self.kategori)
+        dari, ke = self.tier[:, :-1], self.tier[:, 1:]
+        valid = (dari >= 0) & (ke >= 0)
+        hitung = np.bincount(dari[valid].astype(np.int64) * k + ke[valid], minlength=k * k).reshape(k, k)
+        return pd.DataFrame(hitung, index=pd.Index(self.kategori, name='Dari'),
+                            columns=pd.Index(self.kategori, name='Ke'))
+
+    def perubahan_produk(self, i, j, hanya_berubah=True):
+        """Perbandingan per produk antara periode ke-i dan ke-j: tier, nilai, pertumbuhan, arah."""
+        tier_i, tier_j = self.tier[:, i], self.tier[:, j]
+        nilai_i, nilai_j = self.nilai[:, i], self.nilai[:, j]
+        ada = (tier_i >= 0) | (tier_j >= 0)
+        if hanya_berubah:
+            ada &= tier_i != tier_j
+        arah = np.select(
+            [tier_i < 0, tier_j < 0, tier_j > tier_i, tier_j < tier_i],
+            ['Baru', 'Hilang', 'Naik', 'Turun'],
+            default='Tetap',
+        )
+        kategori = pd.CategoricalDtype(self.kategori, ordered=True)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            tumbuh = np.where(nilai_i > 0, (nilai_j - nilai_i) / nilai_i * 100, np.nan)
+        label_i, label_j = self.label()[i], self.label()[j]
+        hasil = pd.DataFrame({
+            'Produk': self.produk[ada],
+            f'Tier {label_i}': pd.Categorical.from_codes(tier_i[ada], dtype=kategori),
+            f'Tier {label_j}': pd.Categorical.from_codes(tier_j[ada], dtype=kategori),
+            'Perubahan': arah[ada],
+            f'{self.ukuran} {label_i}': nilai_i[ada],
+            f'{self.ukuran} {label_j}': nilai_j[ada],
+            'Pertumbuhan (%)': np.round(tumbuh[ada], 1),
+        })
+        return hasil.sort_values(f'{self.ukuran} {label_j}', ascending=False, ignore_index=True)
+
+
+def bandingkan_bulan(df, ukuran=UKURAN_DEFAULT):
+    """Matriks produk × bulan dari DataFrame gabungan (kolom Tahun, Bulan, Produk, Kategori, `ukuran`).
+
+    Baris produk dan kolom periode diubah menjadi kode integer, lalu nilai
+    dijumlahkan dengan satu bincount. Jika satu produk muncul lebih dari sekali
+    dalam satu bulan, tier tertinggi yang dipakai. Urutan tier diambil dari
+    dtype kolom Kategori (category berurutan), jadi jumlah tier bebas.
+    """
+    kode_produk, produk = pd.factorize(df['Produk'].astype(object))
+    periode_baris = df['Tahun'].to_numpy(np.int64) * 100 + df['Bulan'].to_numpy(np.int64)
+    periode_unik, kode_periode = np.unique(periode_baris, return_inverse=True)
+    p, m = len(produk), len(periode_unik)
+
+    sel = kode_produk.astype(np.int64) * m + kode_periode
+    nilai = np.bincount(sel, weights=df[ukuran].to_numpy(np.float64), minlength=p * m).reshape(p, m)
+
+    dtype = df['Kategori'].dtype
+    if not isinstance(dtype, pd.CategoricalDtype):
+        dtype = KOLOM_KATEGORI['Kategori']
+    kode_tier = pd.Categorical(df['Kategori'], dtype=dtype).codes
+    tier = np.full(p * m, -1, dtype=np.int8)
+    urut = np.argsort(kode_tier, kind='stable')  # tier tertinggi ditulis terakhir
+    tier[sel[urut]] = kode_tier[urut]
+
+    return HasilPerbandingan(
+        periode=[(int(x // 100), int(x % 100)) for x in periode_unik],
+        produk=pd.Index(produk, name='Produk'),
+        nilai=nilai,
+        tier=tier.reshape(p, m),
+        ukuran=ukuran,
+        kategori=list(dtype.categories),
+    )
@@ -0,0 +1,52 @@
+# 📅 Periode (tahun, bulan) dari nama file bulanan
+# Fungsi: Satu-satunya tempat yang mengurai nama file 'bulan_<M>_<YYYY>.csv'
+#         dan memberi nama bulan, dipakai ingest, dataset tersimpan,
+#         perbandingan, laporan, dan semua dashboard.
+
+import re
+
+POLA_NAMA_FILE = re.compile(r'bulan_(\d{1,2})_(\d{4})')
+
+# Nama bulan tetap (tidak bergantung locale server, sama dengan strftime('%B') locale C)
+NAMA_BULAN = {
+    1: "January", 2: "February", 3: "March", 4: "April",
+    5: "May", 6: "June", 7: "July", 8: "August",
+    9: "September", 10: "October", 11: "November", 12: "December"
+}
+
+
+def parse_nama_file(file_name):
+    """Ambil (tahun, bulan) dari nama file 'bulan_<M>_<YYYY>.csv', atau None.
+
+    Bulan di luar 1-12 dianggap nama file tidak dikenali.
+    """
+    match = POLA_NAMA_FILE.search(file_name)
+    if not match:
+        return None
+    bulan, tahun = int(match.group(1)), int(match.group(2))
+    if not 1 <= bulan <= 12:
+        return None
+    return tahun, bulan
+
+
+def nama_partisi(tahun, bulan):
+    """Nama tampilan partisi, mengikuti pola nama file upload."""
+    return f"bulan_{bulan}_{tahun}.csv"
+
+
+def nama_bulan(bulan):
+    return NAMA_BULAN.get(int(bulan), f"Bulan {bulan}")
+
+
+def label_periode(tahun, bulan):
+    """Label pendek 'Jan 2024' untuk tabel & grafik antar bulan."""
+    return f"{nama_bulan(bulan)[:3]} {int(tahun)}"
+
+
+def tambah_periode(df, nama_file):
+    """Kolom Tahun & Bulan (nama bulan) dari nama file; tidak berubah jika nama tidak dikenali."""
+    periode = parse_nama_file(nama_file)
+    if periode:
+        tahun, bulan = periode
+        df['Tahun'] = tahun
+        df['Bulan'] = nama_bulan(bulan)
@@ -0,0 +1,171 @@
+# 🗂️ Registri dataset per sesi
+# Fungsi: Menyimpan dataset yang sudah siap pakai (sudah dibaca, di-cluster,
+#         dan diindeks) untuk file-file yang diupload dalam satu sesi, lalu
+#         menyiapkan file lain di latar belakang selama satu file sedang
+#         dilihat. Ganti dataset di sidebar jadi instan. Memori dibatasi:
+#         persiapan latar belakang hanya mengisi sisa kuota, dan saat dataset
+#         baru dibuka, yang paling lama tidak dilihat dibuang lebih dulu.
+
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+
+import pandas as pd
+
+from .clustering import HasilCluster
+from .filters import IndeksFilter
+from .instrumentasi import Instrumentasi, logger
+from .schema import tambah_juta
+
+DEFAULT_REGISTRI_MB = int(os.environ.get("DASHBOARD_SESSION_MB", "256"))
+KOLOM_RENTANG = ('Total Pembeli (Pesanan Dibuat)', 'Total Penjualan (Juta)')
+KOLOM_ANGGOTA = ('Kategori',)
+
+
+@dataclass(frozen=True)
+class DatasetSiap:
+    df: pd.DataFrame
+    hasil_cluster: HasilCluster
+    indeks: IndeksFilter
+    ukuran: int
+
+
+class RegistriDataset:
+    """Dataset siap pakai per (hash dataset, mesin clustering, jumlah cluster) untuk satu sesi.
+
+    `muat()` adalah fungsi tanpa argumen yang mengembalikan DataFrame dengan
+    skema ringkas. Clustering dan indeks memakai cache tingkat proses
+    (`cache_cluster`, `cache_indeks`), jadi sesi lain ikut diuntungkan.
+    Persiapan di latar belakang memakai satu thread supaya tidak berebut CPU
+    dengan dataset yang sedang dilihat.
+    """
+
+    def __init__(self, cache_cluster, cache_indeks, max_bytes=DEFAULT_REGISTRI_MB * 1024 * 1024, max_workers=1):
+        self.cache_cluster = cache_cluster
+        self.cache_indeks = cache_indeks
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.total_bytes = 0
+        self._siap = OrderedDict()   # (kunci, engine, n_clusters) -> DatasetSiap
+        self._proses = {}            # (kunci, engine, n_clusters) -> Future persiapan latar belakang
+        self._dilewati = set()       # hasil latar belakang yang tidak muat di batas memori
+        self._aktif = None           # dataset yang sedang dilihat, tidak pernah dibuang
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="registri")
+        self._lock = threading.Lock()
+
+    def _siapkan(self, kunci, muat, engine, n_clusters, instr):
+        with instr.tahap("baca") as c:
+            df = muat()
+            c['baris'] = len(df)
+        tambah_juta(df)
+        with instr.tahap(f"clustering_{engine}", baris=len(df)):
+            hasil_cluster = self.cache_cluster.ambil(kunci, df, n_clusters=n_clusters, engine=engine)
+        df['Cluster'] = hasil_cluster.labels
+        # Mapping cluster ke kategori label (urut dari rata-rata penjualan terkecil)
+        df['Kategori'] = df['Cluster'].map(hasil_cluster.label_map).astype(hasil_cluster.dtype_kategori)
+        with instr.tahap("indeks_filter", baris=len(df)):
+            indeks = self.cache_indeks.ambil((kunci, engine, n_clusters), df, kolom_rentang=KOLOM_RENTANG,
+                                             kolom_anggota=KOLOM_ANGGOTA)
+        ukuran = int(df.memory_usage(deep=True).sum()) + indeks.ukuran_bytes()
+        return DatasetSiap(df, hasil_cluster, indeks, ukuran)
+
+    def _simpan(self, k, siap, latar=False):
+        with self._lock:
+            if k in self._siap or siap.ukuran > self.max_bytes:
+                return False
+            # Hasil latar belakang hanya mengisi sisa kuota, tidak membuang dataset lain
+            if latar and self.total_bytes + siap.ukuran > self.max_bytes:
+                return False
+            self._siap[k] = siap
+            self.total_bytes += siap.ukuran
+            for lama in list(self._siap):
+                if self.total_bytes <= self.max_bytes:
+                    break
+                if lama not in (k, self._aktif):
+                    self.total_bytes -= self._siap.pop(lama).ukuran
+            if self.total_bytes > self.max_bytes:
+                # Tidak muat tanpa membuang dataset yang sedang dilihat
+                self.total_bytes -= self._siap.pop(k).ukuran
+                return False
+            return True
+
+    def ambil(self, kunci, muat, engine, instr=None, n_clusters=3):
+        """DatasetSiap untuk dataset `kunci`; dari registri jika sudah disiapkan.
+
+        DataFrame di dalamnya dipakai bersama; buat salinan sebelum menambah kolom.
+        `n_clusters` boleh berupa K_OTOMATIS (jumlah cluster dipilih otomatis).
+        """
+        k = (kunci, engine, n_clusters)
+        with self._lock:
+            self._aktif = k
+            if k in self._siap:
+                self._siap.move_to_end(k)
+                self.hits += 1
+                return self._siap[k]
+            self.misses += 1
+            future = self._proses.get(k)
+
+        if future is not None:
+            # Sedang disiapkan di latar belakang: tunggu hasilnya saja
+            siap = future.result()
+        else:
+            siap = self._siapkan(kunci, muat, engine, n_clusters, instr or Instrumentasi("registri", log=False))
+        self._simpan(k, siap)
+        return siap
+
+    def _latar(self, k, muat, pasca):
+        try:
+            kunci, engine, n_clusters = k
+            siap = self._siapkan(kunci, muat, engine, n_clusters, Instrumentasi("registri_latar"))
+            if not self._simpan(k, siap, latar=True):
+                with self._lock:
+                    self._dilewati.add(k)
+            elif pasca is not None:
+                try:
+                    pasca(siap)
+                except Exception:
+                    logger.exception("pasca-persiapan gagal untuk %s", k)
+            return siap
+        finally:
+            with self._lock:
+                self._proses.pop(k, None)
+
+    def siapkan_latar(self, daftar, engine, n_clusters=3):
+        """Antrekan persiapan latar belakang untuk `daftar` berisi (kunci, muat, pasca), sesuai urutan.
+
+        `pasca(siap)` (boleh None) dijalankan setelah dataset tersimpan, mis.
+        untuk pra-render grafik tampilan awal.
+        """
+        with self._lock:
+            for kunci, muat, pasca in daftar:
+                k = (kunci, engine, n_clusters)
+                if k in self._siap or k in self._proses or k in self._dilewati:
+                    continue
+                if self.total_bytes >= self.max_bytes:
+                    break
+                self._proses[k] = self._pool.submit(self._latar, k, muat, pasca)
+
+    def pertahankan(self, kunci_aktif):
+        """Buang dataset (dan antrean) yang file-nya sudah tidak ada di sesi."""
+        kunci_aktif = set(kunci_aktif)
+        with self._lock:
+            for k in [k for k in self._siap if k[0] not in kunci_aktif]:
+                self.total_bytes -= self._siap.pop(k).ukuran
+            for k in [k for k in self._proses if k[0] not in kunci_aktif]:
+                if self._proses[k].cancel():
+                    del self._proses[k]
+            self._dilewati = {k for k in self._dilewati if k[0] in kunci_aktif}
+
+    def statistik(self):
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "siap": len(self._siap),
+                "antrean": len(self._proses),
+                "ukuran_mb": self.total_bytes / (1024 * 1024),
+                "batas_mb": self.max_bytes / (1024 * 1024),
+            }
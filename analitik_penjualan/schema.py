@@ -0,0 +1,121 @@
+# 🧬 Skema tipe data ringkas untuk kolom ekspor marketplace
+# Fungsi: Menentukan dtype hemat memori untuk kolom ekspor & kolom turunan
+#         (kategori untuk teks berulang, integer yang di-downcast, IDR
+#         sebagai fixed-point rupiah bulat), plus laporan memori
+#         sebelum/sesudah skema diterapkan. Validasi kolom wajib dan
+#         parsing kolom angka dari CSV juga di sini, dipakai semua dashboard.
+
+import numpy as np
+import pandas as pd
+
+LABEL_KATEGORI = ['Kurang Laris', 'Laris', 'Sangat Laris']
+
+# Label tier untuk jumlah cluster selain 3 (urut dari penjualan terkecil)
+LABEL_TIER = {
+    2: ['Kurang Laris', 'Laris'],
+    3: LABEL_KATEGORI,
+    4: ['Tidak Laris', 'Kurang Laris', 'Laris', 'Sangat Laris'],
+    5: ['Tidak Laris', 'Kurang Laris', 'Laris', 'Sangat Laris', 'Terlaris'],
+}
+
+
+def label_tier(k):
+    """Label tier berurutan untuk `k` cluster; di luar tabel memakai 'Tier 1' ... 'Tier k'."""
+    return list(LABEL_TIER.get(k) or [f'Tier {i}' for i in range(1, k + 1)])
+
+
+def dtype_kategori(k):
+    """Dtype kolom Kategori (category berurutan) untuk `k` cluster."""
+    return pd.CategoricalDtype(label_tier(k), ordered=True)
+
+
+# Kolom jumlah (integer non-negatif) -> di-downcast ke tipe terkecil yang muat
+KOLOM_INTEGER = [
+    'Total Pembeli (Pesanan Dibuat)',
+    'Produk (Pesanan Dibuat)',
+    'Jumlah',
+    'Cluster',
+    'Bulan',
+    'Tahun',
+]
+
+# Nilai rupiah disimpan sebagai int64 rupiah bulat (fixed-point, 0 desimal).
+# Tetap int64 supaya penjumlahan miliaran rupiah tidak overflow.
+KOLOM_IDR = ['Total Penjualan (Pesanan Dibuat) (IDR)']
+
+# Teks yang selalu berulang -> category
+KOLOM_KATEGORI = {
+    'Kategori': dtype_kategori(3),
+    'Rekomendasi Strategi': 'category',
+    'Nama_Bulan': 'category',
+    'Catatan': 'category',
+}
+
+# Kolom yang wajib ada di file ekspor marketplace
+KOLOM_WAJIB = ('Produk (Pesanan Dibuat)', 'Produk')
+# Kolom turunan: total penjualan dalam juta rupiah (dipakai clustering & filter)
+KOLOM_JUTA = 'Total Penjualan (Juta)'
+
+# Teks yang berulang hanya pada data tertentu (mis. gabungan banyak bulan):
+# dijadikan category jika rasio nilai unik <= batas ini
+KOLOM_KATEGORI_ADAPTIF = ['Produk']
+BATAS_RASIO_UNIK = 0.5
+
+
+def kolom_hilang(kolom, wajib=KOLOM_WAJIB):
+    """Kolom wajib yang tidak ada di daftar `kolom` (list kosong = valid)."""
+    return [k for k in wajib if k not in kolom]
+
+
+def angka(nilai, default=0):
+    """Kolom angka dari CSV: teks/kosong menjadi `default`, bukan error.
+
+    Kolom yang sudah numerik tanpa nilai kosong dikembalikan apa adanya.
+    """
+    if pd.api.types.is_numeric_dtype(nilai) and not nilai.hasnans:
+        return nilai
+    return pd.to_numeric(nilai, errors='coerce').fillna(default)
+
+
+def tambah_juta(df):
+    """Tambah kolom Total Penjualan (Juta) dari kolom IDR (di tempat)."""
+    df[KOLOM_JUTA] = angka(df[KOLOM_IDR[0]]) / 1_000_000
+    return df
+
+
+def memori_mb(df):
+    return df.memory_usage(deep=True).sum() / (1024 * 1024)
+
+
+def terapkan_skema(df):
+    """Kembalikan salinan `df` dengan dtype ringkas. Kolom yang tidak ada dilewati."""
+    df = df.copy()
+    for kolom in KOLOM_INTEGER:
+        if kolom in df.columns and pd.api.types.is_numeric_dtype(df[kolom]) and df[kolom].notna().all():
+            nilai = df[kolom]
+            if pd.api.types.is_float_dtype(nilai):
+                if not np.array_equal(nilai, np.round(nilai)):
+                    continue
+                nilai = nilai.astype('int64')
+            df[kolom] = pd.to_numeric(nilai, downcast='integer')
+    for kolom in KOLOM_IDR:
+        if kolom in df.columns and pd.api.types.is_numeric_dtype(df[kolom]) and df[kolom].notna().all():
+            df[kolom] = df[kolom].round().astype('int64')
+    for kolom, dtype in KOLOM_KATEGORI.items():
+        # Kolom yang sudah category dibiarkan (mis. Kategori dengan jumlah tier selain 3)
+        if kolom in df.columns and not isinstance(df[kolom].dtype, pd.CategoricalDtype):
+            df[kolom] = df[kolom].astype(dtype)
+    for kolom in KOLOM_KATEGORI_ADAPTIF:
+        if kolom in df.columns and len(df) and df[kolom].nunique() / len(df) <= BATAS_RASIO_UNIK:
+            df[kolom] = df[kolom].astype('category')
+    return df
+
+
+def laporan_memori(sebelum, sesudah):
+    """Ringkasan memori (MB) sebelum & sesudah skema, plus penghematannya."""
+    mb_sebelum, mb_sesudah = memori_mb(sebelum), memori_mb(sesudah)
+    return {
+        'sebelum_mb': mb_sebelum,
+        'sesudah_mb': mb_sesudah,
+        'hemat_persen': (1 - mb_sesudah / mb_sebelum) * 100 if mb_sebelum else 0.0,
+    }
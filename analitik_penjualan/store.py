@@ -0,0 +1,98 @@
+# 🗄️ Penyimpanan dataset kolumnar (Parquet) per bulan
+# Fungsi: Menyimpan data penjualan di disk dengan partisi Tahun/Bulan,
+#         sehingga riwayat tidak perlu di-upload & di-parse ulang dari CSV.
+#         Menambah satu bulan hanya menulis partisi bulan itu saja.
+#         Di samping data mentah, tiap partisi bisa menyimpan agregat per
+#         produk (agregat.parquet) supaya ringkasan riwayat bisa dibangun
+#         tanpa membaca ulang baris transaksi.
+#
+# Struktur folder:
+#   <root>/Tahun=2024/Bulan=1/data.parquet
+#   <root>/Tahun=2024/Bulan=1/agregat.parquet   (opsional)
+
+import hashlib
+import os
+import re
+import tempfile
+from contextlib import suppress
+
+DEFAULT_STORE_DIR = os.environ.get("DASHBOARD_STORE_DIR", "data_store")
+_POLA_TAHUN = re.compile(r'Tahun=(\d+)')
+_POLA_BULAN = re.compile(r'Bulan=(\d+)')
+
+
+class DatasetStore:
+    def __init__(self, root=DEFAULT_STORE_DIR):
+        self.root = root
+
+    def _path(self, tahun, bulan, nama="data.parquet"):
+        return os.path.join(self.root, f"Tahun={int(tahun)}", f"Bulan={int(bulan)}", nama)
+
+    def _tulis_atomik(self, df, path, preserve_index=False):
+        import pyarrow as pa  # impor tertunda, lihat pemanasan.py
+        import pyarrow.parquet as pq
+
+        table = pa.Table.from_pandas(df, preserve_index=preserve_index)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Tulis ke file sementara lalu rename, supaya pembaca tidak pernah
+        # melihat file Parquet yang setengah jadi
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        os.close(fd)
+        try:
+            pq.write_table(table, tmp)
+            os.replace(tmp, path)
+        except BaseException:
+            os.remove(tmp)
+            raise
+        return path
+
+    def tulis_bulan(self, df, tahun, bulan):
+        """Tulis (atau timpa) satu partisi bulan. Partisi lain tidak disentuh.
+
+        Agregat lama partisi ini dihapus karena tidak lagi sesuai datanya.
+        """
+        df = df.drop(columns=['Tahun', 'Bulan'], errors='ignore')
+        with suppress(FileNotFoundError):
+            os.remove(self._path(tahun, bulan, "agregat.parquet"))
+        return self._tulis_atomik(df, self._path(tahun, bulan))
+
+    def tulis_agregat(self, agg, tahun, bulan):
+        """Simpan agregat per produk (index = Produk) untuk partisi yang sudah ditulis."""
+        return self._tulis_atomik(agg, self._path(tahun, bulan, "agregat.parquet"), preserve_index=True)
+
+    def baca_agregat(self, tahun, bulan):
+        """Agregat per produk yang tersimpan untuk satu partisi, atau None jika belum ada."""
+        import pyarrow.parquet as pq  # impor tertunda, lihat pemanasan.py
+
+        try:
+            return pq.read_table(self._path(tahun, bulan, "agregat.parquet")).to_pandas()
+        except FileNotFoundError:
+            return None
+
+    def daftar_partisi(self):
+        """List (tahun, bulan) yang tersedia, terurut kronologis."""
+        hasil = []
+        if not os.path.isdir(self.root):
+            return hasil
+        for dir_tahun in os.listdir(self.root):
+            m_tahun = _POLA_TAHUN.fullmatch(dir_tahun)
+            if not m_tahun:
+                continue
+            for dir_bulan in os.listdir(os.path.join(self.root, dir_tahun)):
+                m_bulan = _POLA_BULAN.fullmatch(dir_bulan)
+                if m_bulan and os.path.exists(self._path(m_tahun.group(1), m_bulan.group(1))):
+                    hasil.append((int(m_tahun.group(1)), int(m_bulan.group(1))))
+        return sorted(hasil)
+
+    def kunci_partisi(self, tahun, bulan):
+        """Hash identitas partisi (path + ukuran + waktu ubah) untuk kunci cache."""
+        st_file = os.stat(self._path(tahun, bulan))
+        identitas = f"{self._path(tahun, bulan)}:{st_file.st_size}:{st_file.st_mtime_ns}"
+        return hashlib.sha256(identitas.encode("utf-8")).hexdigest()
+
+    def baca_bulan(self, tahun, bulan, kolom=None):
+        """Baca satu partisi dengan memory-map, hanya kolom yang diminta."""
+        import pyarrow.parquet as pq  # impor tertunda, lihat pemanasan.py
+
+        table = pq.read_table(self._path(tahun, bulan), columns=kolom, memory_map=True)
+        return table.to_pandas()
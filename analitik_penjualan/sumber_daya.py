@@ -0,0 +1,57 @@
+# 🧰 Cache tingkat proses untuk semua dashboard Streamlit
+# Fungsi: Satu set cache (CSV, cluster, indeks filter, grafik, ekspor,
+#         ingest bulanan, dataset tersimpan) yang dipakai ketiga dashboard.
+#         Objeknya dibuat sekali per proses lewat st.cache_resource, jadi
+#         bertahan antar rerun & antar sesi. Hanya modul tampilan yang
+#         mengimpor file ini; modul inti lain tidak bergantung pada Streamlit.
+
+import streamlit as st
+
+from .charts import CacheGrafik
+from .clustering import CacheCluster
+from .cube import KubusRingkasan
+from .ekspor import CacheEkspor
+from .filters import CacheIndeks
+from .ingest import CacheCSV, cache_ingest
+from .store import DatasetStore
+
+
+# CACHE CSV: bertahan antar rerun & antar sesi di proses yang sama
+@st.cache_resource
+def get_cache_csv():
+    return CacheCSV()
+
+# CACHE CLUSTER: K-Means cukup di-fit sekali per dataset
+@st.cache_resource
+def get_cache_cluster():
+    return CacheCluster()
+
+# CACHE INDEKS FILTER: indeks terurut & bitmap dibangun sekali per dataset
+@st.cache_resource
+def get_cache_indeks():
+    return CacheIndeks()
+
+# CACHE GRAFIK: PNG hasil render disimpan, figure selalu ditutup
+@st.cache_resource
+def get_cache_grafik():
+    return CacheGrafik()
+
+# CACHE EKSPOR: file unduhan per dataset + status filter, dibuat saat diklik
+@st.cache_resource
+def get_cache_ekspor():
+    return CacheEkspor()
+
+# CACHE INGEST BULANAN: file yang sama hanya di-parse sekali untuk semua sesi
+@st.cache_resource
+def get_cache_ingest():
+    return cache_ingest()
+
+# DATASET TERSIMPAN (Parquet per Tahun/Bulan)
+@st.cache_resource
+def get_store():
+    return DatasetStore()
+
+# RIWAYAT DATASET TERSIMPAN: satu kubus per proses, dipakai bersama semua sesi
+@st.cache_resource
+def get_kubus_tersimpan():
+    return KubusRingkasan()
@@ -0,0 +1,371 @@
+# 🧩 Halaman dashboard penjualan & clustering K-Means
+# Fungsi: Tampilan Streamlit yang dipakai bersama Dashboard_Penjualan dan
+#         Dashboard_Barang_Unik_Makassar. Semua perhitungan (baca CSV,
+#         clustering, filter, rekomendasi, perbandingan, ekspor) ada di modul
+#         inti; file ini hanya menyusun widget dan menampilkan hasilnya.
+
+from functools import partial
+
+import pandas as pd
+import streamlit as st
+
+from .aturan import terapkan_strategi
+from .charts import gambar_kontribusi, gambar_pesanan_bulanan, gambar_pie_kategori, gambar_top_produk
+from .clustering import DEFAULT_ENGINE, ENGINE, K_OTOMATIS, RENTANG_K
+from .ekspor import FORMAT_EKSPOR
+from .ingest import hash_konten
+from .instrumentasi import DEFAULT_BUDGET_MS, Instrumentasi
+from .pemanasan import panaskan, pemanasan_selesai, tabel_impor
+from .perbandingan import bandingkan_bulan, gabung_bulan
+from .periode import nama_bulan, nama_partisi, parse_nama_file, tambah_periode
+from .registri import RegistriDataset
+from .schema import terapkan_skema
+from .sumber_daya import (get_cache_cluster, get_cache_csv, get_cache_ekspor, get_cache_grafik,
+                          get_cache_indeks, get_store)
+
+# CUSTOM CSS UNTUK TAMPILAN DASHBOARD
+CSS_DASHBOARD = """
+    <style>
+    body {
+        background: linear-gradient(135deg, #e0f7fa 0%, #f1f8e9 100%);
+        color: #333333;
+        font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
+    }
+    .block-container {
+        padding: 2rem 4rem;
+        background: rgba(255, 255, 255, 0.9);
+        border-radius: 16px;
+        box-shadow: 0 8px 24px rgba(0,0,0,0.05);
+    }
+    h1 {
+        color: #1976d2;
+        text-shadow: 1px 1px 2px rgba(0,0,0,0.1);
+    }
+    .stMetric {
+        background: linear-gradient(135deg, #ffffff, #f0f0f0);
+        border-radius: 16px;
+        padding: 1.5rem !important;
+        box-shadow: 0 4px 12px rgba(0,0,0,0.05);
+        border: 1px solid #e0e0e0;
+    }
+    hr {
+        border: none;
+        height: 2px;
+        background: #1976d2;
+        margin: 1rem 0;
+    }
+    </style>
+"""
+
+
+def muat_partisi(tahun, bulan):
+    return terapkan_skema(get_store().baca_bulan(tahun, bulan))
+
+
+def render_grafik(df, instr):
+    """Render 4 grafik utama (PNG, lewat cache grafik) dari data yang sudah difilter."""
+    cache_grafik = get_cache_grafik()
+
+    # VISUALISASI TOP 10 PRODUK TERLARIS
+    top_produk = df.sort_values(by='Produk (Pesanan Dibuat)', ascending=False).head(10)
+    with instr.tahap("grafik_top_produk"):
+        png_top = cache_grafik.render("top_produk", top_produk[['Produk', 'Produk (Pesanan Dibuat)']].astype({'Produk': str}),
+                                      gambar_top_produk, figsize=(6, 4))
+
+    # PIE DISTRIBUSI KATEGORI
+    kategori_counts = df['Kategori'].value_counts()
+    kategori_counts = kategori_counts[kategori_counts > 0]  # buang kategori kosong (dtype category)
+    with instr.tahap("grafik_pie_kategori"):
+        png_pie = cache_grafik.render("pie_kategori", kategori_counts, gambar_pie_kategori, figsize=(6.4, 4.8))
+
+    # VISUALISASI DIAGRAM BATANG MIRIP CONTOH GAMBAR
+    # Buat ringkasan per bulan & tahun
+    monthly_summary = df.groupby(['Bulan', 'Tahun'])['Total Pembeli (Pesanan Dibuat)'].sum().reset_index()
+    with instr.tahap("grafik_pesanan_bulanan"):
+        png_bulanan = cache_grafik.render("pesanan_bulanan", monthly_summary, gambar_pesanan_bulanan, figsize=(8, 6))
+
+    # KONTRIBUSI PENJUALAN
+    cluster_penjualan = df.groupby('Kategori', observed=True)['Total Penjualan (Juta)'].sum().sort_values(ascending=False)
+    with instr.tahap("grafik_kontribusi"):
+        png_kontribusi = cache_grafik.render("kontribusi", cluster_penjualan, gambar_kontribusi, figsize=(6, 4))
+    return png_top, png_pie, png_bulanan, png_kontribusi
+
+
+def pra_render(nama_file, siap):
+    """Render grafik tampilan awal (tanpa filter) supaya sudah ada di cache saat file dibuka."""
+    df = siap.df.copy(deep=False)
+    tambah_periode(df, nama_file)
+    render_grafik(df, Instrumentasi("kmeans_latar", log=False))
+
+
+def tampilkan(kolom_tanpa_ekspor=()):
+    """Jalankan satu rerun halaman. `kolom_tanpa_ekspor` dibuang dari file unduhan."""
+    # CONFIGURASI HALAMAN
+    st.set_page_config(page_title="Dashboard Penjualan", layout="wide", page_icon="📊")
+    st.markdown(CSS_DASHBOARD, unsafe_allow_html=True)
+
+    store = get_store()
+    cache_csv = get_cache_csv()
+    cache_grafik = get_cache_grafik()
+
+    # PEMANASAN: sklearn/seaborn/matplotlib diimpor di latar belakang (sekali per proses),
+    # halaman awal tidak menunggu impor modul berat
+    panaskan()
+
+    # REGISTRI DATASET PER SESI: dataset siap pakai + persiapan file lain di latar belakang
+    if "registri" not in st.session_state:
+        st.session_state["registri"] = RegistriDataset(get_cache_cluster(), get_cache_indeks())
+    registri = st.session_state["registri"]
+
+    # SIDEBAR: PANEL DEBUG PERFORMA (opsional, memori dilacak hanya saat aktif)
+    debug_performa = st.sidebar.checkbox("🐞 Debug performa", help="Waktu, CPU, memori, dan jumlah baris per tahap")
+    budget_ms = DEFAULT_BUDGET_MS
+    if debug_performa:
+        panel_debug = st.sidebar.expander("⏱️ Performa per Tahap", expanded=True)
+        budget_ms = panel_debug.number_input("Budget per tahap (ms)", min_value=1.0, value=float(DEFAULT_BUDGET_MS), step=50.0)
+    instr = Instrumentasi("kmeans", budget_ms=budget_ms, lacak_memori=debug_performa)
+
+    # SIDEBAR: SUMBER DATA
+    sumber_data = st.sidebar.radio("Sumber Data", ["Upload CSV", "Dataset Tersimpan"])
+
+    if sumber_data == "Upload CSV":
+        # SIDEBAR: UPLOAD MULTIPLE CSV
+        uploaded_files = st.sidebar.file_uploader("📁 Upload File CSV", type=['csv'], accept_multiple_files=True)
+        datasets = {file.name: file for file in uploaded_files or []}
+
+        # Simpan file upload ke dataset tersimpan (hanya nama bulan_<M>_<YYYY>.csv)
+        if datasets and st.sidebar.button("💾 Simpan ke Dataset Tersimpan"):
+            disimpan = 0
+            for file in datasets.values():
+                periode = parse_nama_file(file.name)
+                if periode:
+                    store.tulis_bulan(cache_csv.baca(file.getvalue()), *periode)
+                    disimpan += 1
+            st.sidebar.success(f"✅ {disimpan} file disimpan")
+    else:
+        datasets = {nama_partisi(tahun, bulan): (tahun, bulan) for tahun, bulan in store.daftar_partisi()}
+
+    mode_banding = False
+    if datasets:
+        # Buat list nama file
+        file_names = list(datasets)
+
+        # Kunci (hash isi) & fungsi baca untuk setiap dataset; hash file upload dihitung sekali per file
+        if sumber_data == "Upload CSV":
+            kunci_upload = st.session_state.setdefault("kunci_upload", {})
+            kunci_file, muat_file = {}, {}
+            for nama, file in datasets.items():
+                if file.file_id not in kunci_upload:
+                    kunci_upload[file.file_id] = cache_csv.kunci(file.getvalue())
+                kunci_file[nama] = kunci_upload[file.file_id]
+                muat_file[nama] = partial(cache_csv.baca, file.getvalue())
+        else:
+            # Partisi Parquet dibaca memory-mapped tanpa parsing CSV
+            kunci_file = {nama: store.kunci_partisi(*periode) for nama, periode in datasets.items()}
+            muat_file = {nama: partial(muat_partisi, *periode) for nama, periode in datasets.items()}
+
+        registri.pertahankan(kunci_file.values())
+
+        # MODE PERBANDINGAN: semua file bulan_<M>_<YYYY>.csv di-cluster & diringkas bersama
+        periode_file = {nama: parse_nama_file(nama) for nama in file_names}
+        periode_file = {nama: periode for nama, periode in periode_file.items() if periode}
+        # Minimal dua bulan berbeda (beberapa ekspor untuk bulan yang sama dihitung satu)
+        mode_banding = len(set(periode_file.values())) >= 2 and st.sidebar.toggle(
+            "📈 Bandingkan Semua Bulan", help="Pertumbuhan bulan ke bulan & perpindahan tier produk")
+
+        # KMeans Clustering (hasil fit dipakai ulang selama isi file sama)
+        engine = st.sidebar.selectbox("Mesin Clustering", ENGINE, index=ENGINE.index(DEFAULT_ENGINE),
+                                      help="minibatch/stream untuk katalog sangat besar")
+        # Jumlah tier: 3 (bawaan) atau dipilih otomatis per dataset, pilihan k di-cache per hash dataset
+        n_clusters = K_OTOMATIS if st.sidebar.checkbox(
+            "🎯 Jumlah Tier Otomatis",
+            help=f"Evaluasi k = {RENTANG_K.start}–{RENTANG_K.stop - 1} (silhouette) pada sampel data") else 3
+
+    if datasets and mode_banding:
+        st.markdown("""
+        <h1 style='text-align: center;'>📈 Perbandingan Antar Bulan</h1>
+        <hr>
+        """, unsafe_allow_html=True)
+
+        # Gabung & cluster semua bulan sekaligus (tier sebanding antar bulan); hasil disimpan per sesi
+        nama_bulanan = sorted(periode_file, key=periode_file.get)
+        # Kunci memuat periode tiap file: isi yang sama dengan nama bulan berbeda = perbandingan berbeda
+        kunci_banding = (hash_konten("|".join(f"{periode_file[nama]}:{kunci_file[nama]}" for nama in nama_bulanan)
+                                     .encode("utf-8")), engine, n_clusters)
+        if st.session_state.get("perbandingan", (None,))[0] != kunci_banding:
+            with instr.tahap("gabung_bulan") as c:
+                gabungan = gabung_bulan([(*periode_file[nama], muat_file[nama]()) for nama in nama_bulanan])
+                c['baris'] = len(gabungan)
+            with instr.tahap(f"clustering_{engine}", baris=len(gabungan)):
+                hasil_gabungan = get_cache_cluster().ambil(kunci_banding[0], gabungan, n_clusters=n_clusters, engine=engine)
+            gabungan['Kategori'] = pd.Series(hasil_gabungan.labels).map(hasil_gabungan.label_map).astype(hasil_gabungan.dtype_kategori)
+            with instr.tahap("pivot_bulan", baris=len(gabungan)):
+                hasil_banding = bandingkan_bulan(gabungan)
+                pesanan_bulanan = gabungan.groupby(['Tahun', 'Bulan'])['Total Pembeli (Pesanan Dibuat)'].sum().reset_index()
+                pesanan_bulanan['Bulan'] = pesanan_bulanan['Bulan'].map(nama_bulan)
+            st.session_state["perbandingan"] = (kunci_banding, hasil_banding, pesanan_bulanan)
+        _, hasil_banding, pesanan_bulanan = st.session_state["perbandingan"]
+        label = hasil_banding.label()
+
+        # METRIK
+        pertumbuhan = hasil_banding.pertumbuhan_bulanan()
+        col1, col2, col3 = st.columns(3)
+        col1.metric("Jumlah Bulan", len(label))
+        col2.metric("Jumlah Produk", f"{len(hasil_banding.produk):,}")
+        col3.metric(f"Penjualan {label[-1]}", f"Rp{pertumbuhan['Total'].iat[-1] * 1_000_000:,.0f}",
+                    delta=f"{pertumbuhan['Pertumbuhan (%)'].iat[-1]}%")
+
+        # TOTAL PESANAN PER BULAN PER TAHUN (semua bulan) & PERPINDAHAN TIER
+        col4, col5 = st.columns(2)
+        with instr.tahap("grafik_pesanan_bulanan"):
+            png_bulanan = cache_grafik.render("pesanan_bulanan", pesanan_bulanan, gambar_pesanan_bulanan, figsize=(8, 6))
+        col4.image(png_bulanan, width="stretch")
+        col5.markdown("#### 🔀 Perpindahan Tier (bulan berurutan)")
+        col5.dataframe(hasil_banding.transisi_tier())
+
+        st.subheader("📊 Pertumbuhan Bulan ke Bulan - Total Penjualan (Juta)")
+        st.dataframe(pertumbuhan.round(2))
+
+        # PERUBAHAN TIER PER PRODUK ANTARA DUA BULAN
+        st.subheader("🔎 Perubahan Tier per Produk")
+        col6, col7 = st.columns(2)
+        dari = col6.selectbox("Dari Bulan", range(len(label)), index=len(label) - 2, format_func=label.__getitem__)
+        ke = col7.selectbox("Ke Bulan", range(len(label)), index=len(label) - 1, format_func=label.__getitem__)
+        with instr.tahap("perubahan_produk") as c:
+            perubahan = hasil_banding.perubahan_produk(dari, ke)
+            c['baris'] = len(perubahan)
+        jumlah = perubahan['Perubahan'].value_counts()
+        st.caption(" • ".join(f"{arah}: {jumlah.get(arah, 0):,}" for arah in ["Naik", "Turun", "Baru", "Hilang"]))
+        st.dataframe(perubahan)
+
+    elif datasets:
+        # Pilih file yang mau ditampilkan
+        selected_file_name = st.sidebar.selectbox("Pilih Dataset", file_names)
+
+        # Dataset siap pakai (baca + Total Penjualan (Juta) + cluster/Kategori + indeks filter)
+        kunci_dataset = kunci_file[selected_file_name]
+        siap = registri.ambil(kunci_dataset, muat_file[selected_file_name], engine, instr, n_clusters=n_clusters)
+        df = siap.df.copy(deep=False)  # dipakai bersama di registri; kolom baru hanya di salinan
+        hasil_cluster = siap.hasil_cluster
+        centroids = hasil_cluster.centroids
+        indeks = siap.indeks
+
+        # Siapkan file lain di latar belakang, mulai dari file sesudah yang dipilih
+        posisi_file = file_names.index(selected_file_name)
+        urutan = file_names[posisi_file + 1:] + file_names[:posisi_file]
+        registri.siapkan_latar([(kunci_file[nama], muat_file[nama], partial(pra_render, nama)) for nama in urutan],
+                               engine, n_clusters)
+
+        stat = registri.statistik()
+        st.sidebar.caption(f"Dataset siap: {stat['siap']}/{len(file_names)} (antrean {stat['antrean']}) • "
+                           f"{stat['ukuran_mb']:.1f}/{stat['batas_mb']:.0f} MB")
+        if n_clusters == K_OTOMATIS:
+            # Sudah dihitung saat dataset disiapkan, di sini hanya diambil dari cache
+            pilihan_k = get_cache_cluster().pilih_k(kunci_dataset, siap.df)
+            with st.sidebar.expander(f"🎯 Jumlah tier terpilih: {len(centroids)}"):
+                st.dataframe(pilihan_k.skor.round(3))
+        if sumber_data == "Upload CSV":
+            stat = cache_csv.statistik()
+            st.sidebar.caption(f"Cache CSV: {stat['hits']} hit / {stat['misses']} miss / "
+                               f"{stat['menunggu']} tunggu / {stat['disk_hits']} disk • "
+                               f"{stat['ukuran_mb']:.1f}/{stat['batas_mb']:.0f} MB "
+                               f"(tanpa skema ringkas: {stat['ukuran_mentah_mb']:.1f} MB)")
+
+        # SIDEBAR: FILTER DATA
+        st.sidebar.markdown("## 🔍 Filter Data")
+        kategori_filter = st.sidebar.multiselect("Pilih Kategori", options=indeks.nilai_unik('Kategori'), default=indeks.nilai_unik('Kategori'))
+
+        min_pembeli, max_pembeli = map(int, indeks.batas('Total Pembeli (Pesanan Dibuat)'))
+        pembeli_range = st.sidebar.slider("Jumlah Pembeli", min_value=min_pembeli, max_value=max_pembeli, value=(min_pembeli, max_pembeli))
+
+        min_penjualan, max_penjualan = map(float, indeks.batas('Total Penjualan (Juta)'))
+        penjualan_range = st.sidebar.slider("Total Penjualan (Juta)", min_value=min_penjualan, max_value=max_penjualan, value=(min_penjualan, max_penjualan))
+
+        # Filter data (binary search + bitmap, hanya baris yang lolos yang disentuh)
+        with instr.tahap("filter") as c:
+            posisi = indeks.cari(
+                anggota={'Kategori': kategori_filter},
+                rentang={
+                    'Total Pembeli (Pesanan Dibuat)': pembeli_range,
+                    'Total Penjualan (Juta)': penjualan_range,
+                },
+            )
+            if posisi is not None:
+                df = df.iloc[posisi]
+            c['baris'] = len(df)
+
+        # Rekomendasi strategi (lookup per kategori, lihat aturan.ATURAN_STRATEGI)
+        with instr.tahap("rekomendasi", baris=len(df)):
+            df['Rekomendasi Strategi'] = terapkan_strategi(df['Kategori'])
+
+        st.markdown(f"""
+        <h1 style='text-align: center;'>📊 Dashboard Analisis Penjualan<br>{selected_file_name}</h1>
+        <hr>
+        """, unsafe_allow_html=True)
+
+        # METRIK
+        total_penjualan = df['Total Penjualan (Pesanan Dibuat) (IDR)'].sum()
+        total_produk = df['Produk (Pesanan Dibuat)'].sum()
+        total_data = len(df)
+
+        col1, col2, col3 = st.columns(3)
+        col1.metric("Total Penjualan", f"Rp{total_penjualan:,.0f}")
+        col2.metric("Total Produk Terjual", f"{int(total_produk):,} pcs")
+        col3.metric("Jumlah Data Produk", f"{total_data} item")
+
+        # VISUALISASI (grafik dirender lewat cache; tampilan awal sudah dipra-render di latar belakang)
+        tambah_periode(df, selected_file_name)
+        png_top, png_pie, png_bulanan, png_kontribusi = render_grafik(df, instr)
+        col4, col5 = st.columns([2, 1])
+        col4.image(png_top, width="stretch")
+        col5.image(png_pie, width="stretch")
+
+        col6, col7 = st.columns(2)
+        col6.image(png_bulanan, width="stretch")
+        col7.image(png_kontribusi, width="stretch")
+
+        # TABEL REKOMENDASI
+        st.subheader("📌 Rekomendasi Strategi Bisnis per Produk")
+        st.dataframe(df[['Produk', 'Kategori', 'Total Penjualan (Juta)', 'Total Pembeli (Pesanan Dibuat)', 'Rekomendasi Strategi']])
+
+        # DOWNLOAD HASIL (tanpa kolom `kolom_tanpa_ekspor`, mis. Cluster & Distance_to_Centroid)
+        # File dibuat per potongan baris hanya saat tombol diklik (di thread terpisah),
+        # lalu di-cache per dataset + status filter + format
+        format_ekspor = st.selectbox("Format Unduhan", list(FORMAT_EKSPOR), format_func=lambda f: FORMAT_EKSPOR[f][2])
+        ekstensi, mime, _ = FORMAT_EKSPOR[format_ekspor]
+        # Nama file ikut kunci: kolom Tahun/Bulan di file ekspor berasal dari nama file, bukan isinya
+        kunci_ekspor = (kunci_dataset, selected_file_name, engine, n_clusters, tuple(kategori_filter),
+                        pembeli_range, penjualan_range, tuple(kolom_tanpa_ekspor))
+
+        def buat_ekspor(df=df, kunci=kunci_ekspor, format=format_ekspor):
+            with Instrumentasi("kmeans", budget_ms=budget_ms).tahap(f"ekspor_{format}", baris=len(df)):
+                df = df.drop(columns=list(kolom_tanpa_ekspor), errors='ignore')
+                return get_cache_ekspor().ambil(kunci, df, format)
+
+        st.download_button(
+            label="⬇ Download Hasil + Strategi",
+            data=buat_ekspor,
+            file_name=f"hasil_{selected_file_name.replace('.csv','')}_dengan_strategi{ekstensi}",
+            mime=mime,
+            on_click="ignore",
+        )
+
+        # FOOTER
+        st.markdown("""
+        <hr>
+        <p style='text-align: center; font-size: 12px; color: gray;'>
+            Dibuat oleh <b>VioRita Adnyani</b> • Dashboard Penjualan & Clustering K-Means © 2025
+        </p>
+        """, unsafe_allow_html=True)
+
+    elif sumber_data == "Upload CSV":
+        st.info("Silakan upload satu atau lebih file CSV, lalu pilih file untuk ditampilkan.")
+    else:
+        st.info("Belum ada dataset tersimpan. Upload CSV lalu klik 💾 Simpan ke Dataset Tersimpan.")
+
+    # Tampilkan hasil pengukuran di panel debug (setelah semua tahap selesai)
+    if debug_performa:
+        instr.tampilkan(panel_debug)
+        # Cold start: waktu impor modul berat di proses ini
+        panel_debug.caption("Pemanasan modul berat: " + ("selesai" if pemanasan_selesai() else "berjalan…"))
+        panel_debug.dataframe(tabel_impor()[['tahap', 'wall_ms']].round(1), hide_index=True)
@@ -2,172 +2,256 @@
 # Fungsi: Mengunggah file CSV penjualan per bulan,
 #         memeriksa struktur file, menampilkan ringkasan,
 #         grafik penjualan, dan analisis top produk.
+#         Mode "Tambah Bulan Baru" hanya menerima file bulan terbaru;
+#         riwayat diambil dari dataset tersimpan tanpa diproses ulang.
+#         Parsing, validasi, dan agregasi ada di paket inti analitik_penjualan.
+
+import os
+import sys
 
 import streamlit as st
 import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
-import re
+
+# Script dijalankan langsung oleh `streamlit run`: folder induk repo ditambahkan
+# supaya paket inti bisa diimpor
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from analitik_penjualan.aturan import terapkan_catatan
+from analitik_penjualan.charts import gambar_penjualan_bulanan, gambar_top5
+from analitik_penjualan.cube import KubusRingkasan, agregasi_produk, sinkron_riwayat
+from analitik_penjualan.ingest import kunci_file, proses_file, proses_file_stream, proses_paralel
+from analitik_penjualan.instrumentasi import DEFAULT_BUDGET_MS, Instrumentasi, atur_logging
+from analitik_penjualan.pemanasan import panaskan, pemanasan_selesai, tabel_impor
+from analitik_penjualan.periode import nama_bulan
+from analitik_penjualan.sumber_daya import (get_cache_grafik, get_cache_ingest,
+                                            get_kubus_tersimpan, get_store)
+
+# Log performa per tahap ke stderr server
+atur_logging()
 
 # Konfigurasi Halaman
 st.set_page_config(page_title="Dashboard Penjualan Bulanan", layout="wide")
 st.title("📦 Dashboard Penjualan Lengkap")
 
-# Upload File CSV
-uploaded_files = st.file_uploader(
-    "📁 Upload file CSV (penjualan per bulan)", 
-    type="csv", 
-    accept_multiple_files=True
-)
-
-if uploaded_files:
-    all_data = []  # Menyimpan semua data yang valid dari setiap file
-
-    st.subheader("🧪 Pemeriksaan Struktur File CSV")
-    for file in uploaded_files:
-        file_name = file.name
-        st.markdown(f"#### 📁 {file_name}")
-
-        try:
-            # Membaca ulang dari awal untuk menghindari posisi file yang salah
-            file.seek(0)
-            df = pd.read_csv(file, encoding='ISO-8859-1')
-
-            # Menampilkan jumlah baris & kolom
-            st.write(f"Jumlah baris: {len(df)}")
-            st.write("Kolom ditemukan:", list(df.columns))
-
-            # Validasi kolom penting
-            if 'Produk (Pesanan Dibuat)' not in df.columns or 'Produk' not in df.columns:
-                st.error("❌ Kolom 'Produk (Pesanan Dibuat)' atau 'Produk' TIDAK DITEMUKAN")
-                continue
-            elif df.empty or df['Produk (Pesanan Dibuat)'].dropna().empty:
-                st.warning("⚠️ File ini kosong atau tidak ada data penjualan")
-                continue
-            else:
-                st.success("✅ Struktur file valid")
-
-            # Ekstrak bulan & tahun dari nama file 
-            match = re.search(r'bulan_(\d{1,2})_(\d{4})', file_name)
-            if match:
-                bulan, tahun = int(match.group(1)), int(match.group(2))
-            else:
-                st.warning(f"❌ Nama file tidak dikenali: {file_name}")
-                continue
-
-            # Konversi jumlah produk ke integer
-            df['Jumlah'] = pd.to_numeric(df['Produk (Pesanan Dibuat)'], errors='coerce').fillna(0).astype(int)
-
-            # Tambahkan kolom informasi waktu
-            df['Bulan'] = bulan
-            df['Tahun'] = tahun
-            df['Nama_Bulan'] = pd.to_datetime(f"{tahun}-{bulan}-01").strftime('%B')
-
-            # Simpan data yang valid
-            all_data.append(df)
-
-        except Exception as e:
-            st.error(f"❌ Gagal membaca file: {e}")
-
-    # Proses jika ada data valid
-    if all_data:
-        # Gabungkan semua data
-        df_all = pd.concat(all_data, ignore_index=True)
-
-        # Ringkasan total penjualan per bulan
-        st.subheader("📊 Ringkasan Total Penjualan per Bulan")
-        summary = df_all.groupby(['Tahun', 'Bulan', 'Nama_Bulan'])['Jumlah'].sum().reset_index()
-        summary_sorted = summary.sort_values(by='Jumlah', ascending=False)
-
-        # Tampilkan bulan dengan penjualan tertinggi
-        best = summary_sorted.iloc[0]
-        st.success(f"📌 Penjualan terbanyak: **{best['Nama_Bulan']} {int(best['Tahun'])}** sebanyak **{int(best['Jumlah'])} pesanan**.")
-        st.info(f"💡 Strategi: Tingkatkan stok & promosi sebelum **{best['Nama_Bulan']}** setiap tahun.")
-
-        # Tabel ringkasan
-        st.dataframe(summary.sort_values(by=['Tahun', 'Bulan']))
-
-        # Grafik penjualan bulanan
-        st.subheader("📉 Grafik Penjualan Bulanan")
-        plt.figure(figsize=(12, 6))
-        sns.barplot(data=summary, x='Nama_Bulan', y='Jumlah', hue='Tahun', palette='tab10')
-        plt.ylabel("Total Pesanan")
-        plt.xlabel("Bulan")
-        plt.xticks(rotation=45)
-        st.pyplot(plt.gcf())
-
-        # Tabel Total Pesanan
-        st.subheader("📋 Total Pesanan per Bulan")
-        summary_display = summary.sort_values(by=['Tahun', 'Bulan'])
-        summary_display['Periode'] = summary_display['Nama_Bulan'] + " " + summary_display['Tahun'].astype(str)
-        summary_display = summary_display[['Periode', 'Jumlah']].rename(columns={'Jumlah': 'Total Pesanan'})
-        st.table(summary_display.set_index('Periode'))
-
-        # Filter bulan & tahun untuk analisis detail
-        st.subheader("🗂️ Filter Data Berdasarkan Bulan dan Tahun")
-        bulan_terpilih = st.selectbox("Pilih Bulan", options=sorted(df_all['Nama_Bulan'].unique()))
-        tahun_terpilih = st.selectbox("Pilih Tahun", options=sorted(df_all['Tahun'].unique()))
-        df_filtered = df_all[(df_all['Nama_Bulan'] == bulan_terpilih) & (df_all['Tahun'] == tahun_terpilih)]
-
-        # Top 5 produk paling laris
-        st.subheader(f"🏆 Top 5 Produk Paling Laris - {bulan_terpilih} {tahun_terpilih}")
-        if not df_filtered.empty:
-            produk_total_all = df_filtered.groupby('Produk')['Jumlah'].sum().sort_values(ascending=False)
-            top5 = produk_total_all.head(5)[::-1]  # Balik urutan biar tampil dari bawah ke atas
-            total_semua = df_filtered['Jumlah'].sum()
-            persentase = (top5 / total_semua * 100).round(1)
-
-            # Fungsi catatan dinamis
-            def catatan_produk_laris(nama_produk):
-                nama_produk = nama_produk.lower()
-                if "bulu mata" in nama_produk:
-                    return "Trend kecantikan akhir tahun"
-                elif "alis" in nama_produk:
-                    return "Permintaan alat kecantikan meningkat"
-                elif "taplak" in nama_produk or "meja makan" in nama_produk:
-                    return "Dekorasi rumah menjelang liburan"
-                elif "korean" in nama_produk:
-                    return "Produk viral di media sosial"
-                elif "penjepit" in nama_produk:
-                    return "Alat kecantikan praktis dan murah"
+store = get_store()
+
+def kunci_upload(file):
+    """Hash file upload, dihitung sekali per file (bukan di setiap rerun)."""
+    kunci = st.session_state.setdefault("kunci_upload", {})
+    if file.file_id not in kunci:
+        kunci[file.file_id] = kunci_file(file.name, file)
+    return kunci[file.file_id]
+
+# Seaborn/matplotlib/pyarrow.parquet diimpor di latar belakang (sekali per proses), halaman awal tidak menunggu
+panaskan(('matplotlib.pyplot', 'seaborn', 'pyarrow.parquet'))
+
+# Panel debug performa (opsional, memori dilacak hanya saat aktif)
+debug_performa = st.sidebar.checkbox("🐞 Debug performa", help="Waktu, CPU, memori, dan jumlah baris per tahap")
+budget_ms = DEFAULT_BUDGET_MS
+if debug_performa:
+    panel_debug = st.sidebar.expander("⏱️ Performa per Tahap", expanded=True)
+    budget_ms = panel_debug.number_input("Budget per tahap (ms)", min_value=1.0, value=float(DEFAULT_BUDGET_MS), step=50.0)
+instr = Instrumentasi("bulanan", budget_ms=budget_ms, lacak_memori=debug_performa)
+
+sumber_data = st.radio("Sumber Data", ["Upload CSV", "Dataset Tersimpan", "Tambah Bulan Baru"], horizontal=True)
+
+# Kubus ringkasan: per sesi untuk upload, bersama (per proses) untuk dataset tersimpan
+if sumber_data == "Upload CSV":
+    kubus = st.session_state.setdefault(f"kubus_{sumber_data}", KubusRingkasan())
+else:
+    kubus = get_kubus_tersimpan()
+uploaded_files = None
+periode_fokus = None  # (tahun, bulan) yang langsung dipilih di analisis detail
+
+if sumber_data == "Upload CSV":
+    # Upload File CSV
+    uploaded_files = st.file_uploader(
+        "📁 Upload file CSV (penjualan per bulan)", 
+        type="csv", 
+        accept_multiple_files=True
+    )
+
+    # Mode streaming: header dicek dulu, isi file diagregasi per chunk
+    mode_stream = st.checkbox("⚡ Mode streaming (file sangat besar)",
+                              help="Header divalidasi dari baris pertama, lalu file dibaca per potongan "
+                                   "tanpa memuat seluruh isinya ke memori.")
+
+    # Kubus dipangkas di setiap rerun: file yang dihapus dari upload (atau semua file) ikut keluar
+    files = [(file.name, file) for file in uploaded_files or ()]
+    kunci_files = [kunci_upload(file) for file in uploaded_files or ()]
+    kubus.pertahankan(kunci_files)
+
+    if uploaded_files:
+        st.subheader("🧪 Pemeriksaan Struktur File CSV")
+
+        # Hanya file yang belum ada di kubus yang dibaca & divalidasi (paralel); file yang
+        # diupload ulang masuk lagi, file tidak valid diambil dari cache ingest bersama
+        pesan_ingest = st.session_state.setdefault("pesan_ingest", {})
+        baru = [(f, k) for f, k in zip(files, kunci_files) if not kubus.punya(k)]
+        with instr.tahap("ingest_stream" if mode_stream else "ingest") as c:
+            hasil_ingest = proses_paralel((f for f, _ in baru), fungsi=proses_file_stream if mode_stream else proses_file,
+                                          cache=get_cache_ingest(), kunci=(k for _, k in baru))
+            c['baris'] = 0
+            for (_, kunci), (_, pesan, hasil) in zip(baru, hasil_ingest):
+                pesan_ingest[kunci] = pesan
+                if hasil is None:
+                    continue
+                if mode_stream:
+                    tahun, bulan, agg = hasil
+                    kubus.tambah_agregat(kunci, agg, tahun, bulan)
+                    c['baris'] += len(agg)
                 else:
-                    return "Kemungkinan efek diskon/promosi"
-
-            # Grafik top 5 produk
-            plt.figure(figsize=(12, 6))
-            ax = sns.barplot(x=top5.values, y=top5.index, color='#FFB47D')
-            plt.title(f"Kategori Produk Paling Laris - {bulan_terpilih} {tahun_terpilih}", fontsize=18, fontweight='bold')
-            plt.xlabel("Jumlah Pesanan", fontsize=12)
-
-            # Tambahkan label jumlah & persentase di bar chart
-            for i, (val, pct) in enumerate(zip(top5.values, persentase.values)):
-                ax.text(val + max(top5.values) * 0.01, i, f"{pct}%\n{val} pesanan", va='center', fontsize=10)
-
-            plt.tight_layout()
-            st.pyplot(plt.gcf())
-
-            # Tabel top 5 + catatan
-            st.markdown("#### 📌 Detail Top 5 Produk dengan Catatan")
-            top5_df = pd.DataFrame({
-                'Produk': top5.index,
-                'Jumlah Pesanan': top5.values,
-                'Persentase': persentase.values
-            })
-            top5_df['Catatan'] = top5_df['Produk'].apply(catatan_produk_laris)
-            st.dataframe(top5_df.reset_index(drop=True))
-
-            # Produk lainnya
-            st.subheader("📦 Produk Lainnya (di luar Top 5)")
-            produk_lain = produk_total_all.iloc[5:]
-            if not produk_lain.empty:
-                produk_lain_df = produk_lain.reset_index()
-                produk_lain_df.columns = ['Produk', 'Jumlah Pesanan']
-                st.dataframe(produk_lain_df)
-            else:
-                st.info("✅ Tidak ada produk lain di luar Top 5.")
+                    kubus.tambah_bulan(kunci, hasil, hasil['Tahun'].iat[0], hasil['Bulan'].iat[0])
+                    c['baris'] += len(hasil)
+
+        for (file_name, _), kunci in zip(files, kunci_files):
+            st.markdown(f"#### 📁 {file_name}")
+            for jenis, *argumen in pesan_ingest[kunci]:
+                getattr(st, jenis)(*argumen)
+
+        # Simpan file valid ke dataset tersimpan (hanya partisi bulan tsb yang ditulis)
+        if not kubus.kosong() and st.button("💾 Simpan ke Dataset Tersimpan"):
+            disimpan = 0
+            for _, _, df in proses_paralel(files, cache=get_cache_ingest(), kunci=kunci_files):
+                if df is not None:
+                    tahun, bulan = df['Tahun'].iat[0], df['Bulan'].iat[0]
+                    store.tulis_bulan(df.drop(columns=['Jumlah', 'Nama_Bulan']), tahun, bulan)
+                    store.tulis_agregat(agregasi_produk(df), tahun, bulan)
+                    disimpan += 1
+            st.success(f"✅ {disimpan} bulan disimpan")
+else:
+    # Riwayat dari dataset tersimpan; hanya partisi yang belum ada di kubus yang dibaca
+    with instr.tahap("baca_parquet") as c:
+        c['baris'] = sinkron_riwayat(kubus, store)
+
+    if sumber_data == "Tambah Bulan Baru":
+        riwayat = kubus.ringkasan_bulanan()
+        if len(riwayat):
+            terakhir = riwayat.iloc[-1]
+            st.caption(f"Riwayat tersimpan: {len(riwayat)} bulan, terakhir "
+                       f"{terakhir['Nama_Bulan']} {int(terakhir['Tahun'])}")
+        file_baru = st.file_uploader("📁 Upload file bulan baru (bulan_<M>_<YYYY>.csv)", type="csv")
+
+        if file_baru:
+            # Hanya file bulan baru yang dibaca, divalidasi, dan disimpan; total bulan lain tidak dihitung ulang
+            bulan_ditambah = st.session_state.setdefault("bulan_ditambah", {})
+            kunci = kunci_upload(file_baru)
+            if kunci not in bulan_ditambah:
+                with instr.tahap("tambah_bulan") as c:
+                    [(_, pesan, df)] = proses_paralel([(file_baru.name, file_baru)], cache=get_cache_ingest(), kunci=[kunci])
+                    periode, sudah_ada = None, False
+                    c['baris'] = 0 if df is None else len(df)
+                    if df is not None:
+                        periode = (int(df['Tahun'].iat[0]), int(df['Bulan'].iat[0]))
+                        sudah_ada = ((riwayat['Tahun'] == periode[0]) & (riwayat['Bulan'] == periode[1])).any()
+                        store.tulis_bulan(df.drop(columns=['Jumlah', 'Nama_Bulan']), *periode)
+                        store.tulis_agregat(agregasi_produk(df), *periode)
+                        # Partisi bulan ini saja yang berubah (agregatnya sudah ditulis, tidak ada
+                        # baris mentah yang dibaca ulang); versi lama (jika ada) dibuang dari kubus
+                        sinkron_riwayat(kubus, store)
+                bulan_ditambah[kunci] = (pesan, periode, sudah_ada)
+
+            pesan, periode_fokus, sudah_ada = bulan_ditambah[kunci]
+            st.markdown(f"#### 📁 {file_baru.name}")
+            for jenis, *argumen in pesan:
+                getattr(st, jenis)(*argumen)
+            if periode_fokus:
+                st.success(f"✅ {nama_bulan(periode_fokus[1])} {periode_fokus[0]} "
+                           f"{'diperbarui di' if sudah_ada else 'ditambahkan ke'} riwayat")
+
+# Proses jika ada data valid
+if not kubus.kosong():
+    # Ringkasan total penjualan per bulan (dari kubus, bukan baris mentah)
+    st.subheader("📊 Ringkasan Total Penjualan per Bulan")
+    with instr.tahap("ringkasan_bulanan") as c:
+        summary = kubus.ringkasan_bulanan()
+        c['baris'] = len(summary)
+
+    # Tampilkan bulan dengan penjualan tertinggi
+    best = kubus.bulan_terbaik()
+    st.success(f"📌 Penjualan terbanyak: **{best['Nama_Bulan']} {int(best['Tahun'])}** sebanyak **{int(best['Jumlah'])} pesanan**.")
+    st.info(f"💡 Strategi: Tingkatkan stok & promosi sebelum **{best['Nama_Bulan']}** setiap tahun.")
+
+    # Tabel ringkasan
+    st.dataframe(summary.sort_values(by=['Tahun', 'Bulan']))
+
+    # Grafik penjualan bulanan
+    st.subheader("📉 Grafik Penjualan Bulanan")
+    cache_grafik = get_cache_grafik()
+    with instr.tahap("grafik_penjualan_bulanan", baris=len(summary)):
+        png_bulanan = cache_grafik.render("penjualan_bulanan", summary[['Nama_Bulan', 'Jumlah', 'Tahun']],
+                                          gambar_penjualan_bulanan, figsize=(12, 6))
+    st.image(png_bulanan, width="stretch")
+
+    # Tabel Total Pesanan
+    st.subheader("📋 Total Pesanan per Bulan")
+    summary_display = summary.sort_values(by=['Tahun', 'Bulan'])
+    summary_display['Periode'] = summary_display['Nama_Bulan'] + " " + summary_display['Tahun'].astype(str)
+    summary_display = summary_display[['Periode', 'Jumlah']].rename(columns={'Jumlah': 'Total Pesanan'})
+    st.table(summary_display.set_index('Periode'))
+
+    # Filter bulan & tahun untuk analisis detail
+    st.subheader("🗂️ Filter Data Berdasarkan Bulan dan Tahun")
+    opsi_bulan = sorted(summary['Nama_Bulan'].unique())
+    opsi_tahun = sorted(summary['Tahun'].unique())
+    if periode_fokus and nama_bulan(periode_fokus[1]) in opsi_bulan and periode_fokus[0] in opsi_tahun:
+        indeks_bulan, indeks_tahun = opsi_bulan.index(nama_bulan(periode_fokus[1])), opsi_tahun.index(periode_fokus[0])
+    else:
+        indeks_bulan = indeks_tahun = 0
+    bulan_terpilih = st.selectbox("Pilih Bulan", options=opsi_bulan, index=indeks_bulan)
+    tahun_terpilih = st.selectbox("Pilih Tahun", options=opsi_tahun, index=indeks_tahun)
+    periode_terpilih = summary[(summary['Nama_Bulan'] == bulan_terpilih) & (summary['Tahun'] == tahun_terpilih)]
+
+    # Top 5 produk paling laris
+    st.subheader(f"🏆 Top 5 Produk Paling Laris - {bulan_terpilih} {tahun_terpilih}")
+    if not periode_terpilih.empty:
+        with instr.tahap("produk_bulan") as c:
+            produk_total_all = kubus.produk_bulan(tahun_terpilih, periode_terpilih['Bulan'].iat[0])
+            c['baris'] = len(produk_total_all)
+        top5 = produk_total_all.head(5)[::-1]  # Balik urutan biar tampil dari bawah ke atas
+        total_semua = periode_terpilih['Jumlah'].iat[0]  # termasuk baris dengan Produk kosong
+        persentase = (top5 / total_semua * 100).round(1)
+
+        # Grafik top 5 produk
+        data_top5 = pd.DataFrame({'Jumlah': top5, 'Persentase': persentase})
+        judul = f"Kategori Produk Paling Laris - {bulan_terpilih} {tahun_terpilih}"
+        with instr.tahap("grafik_top5", baris=len(data_top5)):
+            png_top5 = cache_grafik.render("top5", data_top5, gambar_top5, figsize=(12, 6), judul=judul)
+        st.image(png_top5, width="stretch")
+
+        # Tabel top 5 + catatan
+        st.markdown("#### 📌 Detail Top 5 Produk dengan Catatan")
+        top5_df = pd.DataFrame({
+            'Produk': top5.index,
+            'Jumlah Pesanan': top5.values,
+            'Persentase': persentase.values
+        })
+        top5_df['Catatan'] = terapkan_catatan(top5_df['Produk'])  # aturan.ATURAN_CATATAN
+        st.dataframe(top5_df.reset_index(drop=True))
+
+        # Produk lainnya
+        st.subheader("📦 Produk Lainnya (di luar Top 5)")
+        produk_lain = produk_total_all.iloc[5:]
+        if not produk_lain.empty:
+            produk_lain_df = produk_lain.reset_index()
+            produk_lain_df.columns = ['Produk', 'Jumlah Pesanan']
+            st.dataframe(produk_lain_df)
         else:
-            st.warning("⚠️ Tidak ada data penjualan pada bulan dan tahun ini.")
+            st.info("✅ Tidak ada produk lain di luar Top 5.")
     else:
-        st.warning("⚠️ Tidak ada file valid untuk diproses.")
-else:
+        st.warning("⚠️ Tidak ada data penjualan pada bulan dan tahun ini.")
+elif uploaded_files:
+    st.warning("⚠️ Tidak ada file valid untuk diproses.")
+elif sumber_data == "Upload CSV":
     st.info("⬆️ Upload file CSV penjualan untuk mulai analisis.")
+elif sumber_data == "Tambah Bulan Baru":
+    st.info("Belum ada riwayat tersimpan. Upload file bulan pertama di atas untuk memulai.")
+else:
+    st.info("Belum ada dataset tersimpan. Upload CSV lalu klik 💾 Simpan ke Dataset Tersimpan.")
+
+# Tampilkan hasil pengukuran di panel debug (setelah semua tahap selesai)
+if debug_performa:
+    instr.tampilkan(panel_debug)
+    # Cold start: waktu impor modul berat di proses ini
+    panel_debug.caption("Pemanasan modul berat: " + ("selesai" if pemanasan_selesai() else "berjalan…"))
+    panel_debug.dataframe(tabel_impor()[['tahap', 'wall_ms']].round(1), hide_index=True)
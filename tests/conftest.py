@@ -0,0 +1,8 @@
+# Test inti analitik_penjualan (tanpa Streamlit).
+# Folder repo ditambahkan ke sys.path, sama seperti script dashboard,
+# karena paket inti tidak di-install.
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
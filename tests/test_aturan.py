@@ -0,0 +1,69 @@
+import pandas as pd
+import pytest
+
+from analitik_penjualan.aturan import ATURAN_STRATEGI, terapkan_catatan, terapkan_strategi
+from analitik_penjualan.clustering import RENTANG_K
+from analitik_penjualan.schema import dtype_kategori, label_tier
+
+
+@pytest.mark.parametrize("k", RENTANG_K)
+def test_strategi_tier_teratas_dan_terbawah_untuk_semua_k(k):
+    tier = pd.Series(pd.Categorical(dtype_kategori(k).categories, dtype=dtype_kategori(k)))
+    strategi = terapkan_strategi(tier).tolist()
+    saran_bawah = (ATURAN_STRATEGI['Kurang Laris'], ATURAN_STRATEGI['Tidak Laris'])
+    # Produk terlaris tidak boleh mendapat saran tier terbawah (dan sebaliknya)
+    assert strategi[-1] not in saran_bawah
+    assert strategi[0] in saran_bawah
+
+
+def rekomendasi(kategori):
+    """Rantai if/elif asli untuk kolom Rekomendasi Strategi (acuan mesin aturan)."""
+    if kategori == 'Sangat Laris':
+        return "Pertahankan stok & promosi rutin"
+    elif kategori == 'Laris':
+        return "Tingkatkan promosi jadi sangat laris"
+    else:
+        return "Evaluasi produk/buat bundling"
+
+
+def test_strategi_sama_dengan_rantai_if_elif():
+    kategori = pd.Series(pd.Categorical(label_tier(3) * 4 + ['Sangat Laris'], dtype=dtype_kategori(3)),
+                         index=range(10, 23))
+    hasil = terapkan_strategi(kategori)
+    assert hasil.index.equals(kategori.index)
+    assert hasil.astype(str).tolist() == [rekomendasi(k) for k in kategori]
+
+
+def catatan_produk_laris(nama_produk):
+    """Rantai if/elif asli dashboard bulanan (acuan mesin aturan)."""
+    nama_produk = nama_produk.lower()
+    if "bulu mata" in nama_produk:
+        return "Trend kecantikan akhir tahun"
+    elif "alis" in nama_produk:
+        return "Permintaan alat kecantikan meningkat"
+    elif "taplak" in nama_produk or "meja makan" in nama_produk:
+        return "Dekorasi rumah menjelang liburan"
+    elif "korean" in nama_produk:
+        return "Produk viral di media sosial"
+    elif "penjepit" in nama_produk:
+        return "Alat kecantikan praktis dan murah"
+    else:
+        return "Kemungkinan efek diskon/promosi"
+
+
+NAMA_PRODUK = [
+    "Bulu Mata Palsu", "Pensil ALIS", "Taplak Meja Makan", "meja makan lipat", "Korean Bag",
+    "Penjepit Rambut", "Gelas Unik", "Pensil alis + bulu mata", "korean penjepit", "", "salis",
+]
+
+
+def test_catatan_sama_dengan_rantai_if_elif():
+    hasil = terapkan_catatan(pd.Series(NAMA_PRODUK))
+    assert hasil.tolist() == [catatan_produk_laris(nama) for nama in NAMA_PRODUK]
+
+
+def test_catatan_index_duplikat():
+    nama = pd.Series(['alis', 'bulu mata', 'gelas'], index=[0, 0, 7])
+    hasil = terapkan_catatan(nama)
+    assert hasil.index.tolist() == [0, 0, 7]
+    assert hasil.tolist() == [catatan_produk_laris(n) for n in nama]
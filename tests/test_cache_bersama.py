@@ -0,0 +1,61 @@
+import threading
+import time
+
+from analitik_penjualan.cache_bersama import CacheBersama
+
+
+def test_single_flight_hitung_sekali():
+    cache = CacheBersama("uji", max_bytes=1024 * 1024, folder=None)
+    jumlah_thread = 8
+    dipanggil = []
+    mulai = threading.Barrier(jumlah_thread)
+    hasil = [None] * jumlah_thread
+
+    def hitung():
+        dipanggil.append(1)
+        time.sleep(0.2)  # beri waktu thread lain ikut meminta kunci yang sama
+        return {"nilai": 42}
+
+    def sesi(i):
+        mulai.wait()
+        hasil[i] = cache.ambil("kunci", hitung)
+
+    thread = [threading.Thread(target=sesi, args=(i,)) for i in range(jumlah_thread)]
+    for t in thread:
+        t.start()
+    for t in thread:
+        t.join()
+
+    assert len(dipanggil) == 1
+    assert all(h is hasil[0] for h in hasil)
+    statistik = cache.statistik()
+    assert statistik["misses"] == 1
+    assert statistik["menunggu"] + statistik["hits"] == jumlah_thread - 1
+
+
+def test_error_diteruskan_ke_yang_menunggu_lalu_dihitung_ulang():
+    cache = CacheBersama("uji", max_bytes=1024 * 1024, folder=None)
+    siap = threading.Event()
+    galat = []
+
+    def gagal():
+        siap.wait(1)
+        raise ValueError("rusak")
+
+    def sesi():
+        try:
+            cache.ambil("kunci", gagal)
+        except ValueError as e:
+            galat.append(e)
+
+    thread = [threading.Thread(target=sesi) for _ in range(3)]
+    for t in thread:
+        t.start()
+    time.sleep(0.1)
+    siap.set()
+    for t in thread:
+        t.join()
+
+    assert len(galat) == 3
+    # Kegagalan tidak disimpan: permintaan berikutnya menghitung ulang
+    assert cache.ambil("kunci", lambda: "ok") == "ok"
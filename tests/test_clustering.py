@@ -0,0 +1,40 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from analitik_penjualan.benchmark import buat_ekspor
+from analitik_penjualan.clustering import ENGINE, fit_kategori
+from analitik_penjualan.schema import tambah_juta
+
+
+@pytest.fixture(scope="module")
+def data_miring():
+    # Distribusi pembeli pareto: banyak produk sepi, sedikit yang sangat laris
+    return tambah_juta(buat_ekspor(20_000))
+
+
+def _kategori(df, hasil):
+    return pd.Series(hasil.labels).map(hasil.label_map).to_numpy()
+
+
+def _centroid_per_tier(hasil):
+    # Centroid diurutkan sesuai tier (Kurang Laris -> Sangat Laris)
+    tier = {label: i for i, label in enumerate(hasil.dtype_kategori.categories)}
+    urutan = sorted(hasil.label_map, key=lambda c: tier[hasil.label_map[c]])
+    return hasil.centroids[urutan]
+
+
+@pytest.mark.parametrize("engine", [e for e in ENGINE if e != 'kmeans'])
+def test_engine_setara_kmeans_pada_data_miring(data_miring, engine):
+    acuan = fit_kategori(data_miring, engine='kmeans')
+    hasil = fit_kategori(data_miring, engine=engine)
+
+    assert (_kategori(data_miring, hasil) == _kategori(data_miring, acuan)).mean() > 0.95
+    # Tier tertinggi tetap berisi produk terlaris (bukan ditarik ke produk sepi)
+    np.testing.assert_allclose(_centroid_per_tier(hasil), _centroid_per_tier(acuan), rtol=0.25, atol=5)
+
+
+def test_urutan_tier_mengikuti_penjualan(data_miring):
+    hasil = fit_kategori(data_miring)
+    rata = data_miring.groupby(_kategori(data_miring, hasil))['Total Penjualan (Juta)'].mean()
+    assert rata.sort_values().index.tolist() == list(hasil.dtype_kategori.categories)
@@ -0,0 +1,94 @@
+import pandas as pd
+import pytest
+
+from analitik_penjualan.benchmark import buat_ekspor
+from analitik_penjualan.cube import KOLOM_UKURAN, KubusRingkasan, agregasi_produk
+
+
+def _bulan(n, seed):
+    df = buat_ekspor(n, seed)
+    # Nama produk berulang antar file supaya Top 5 menggabungkan beberapa sumber
+    df['Produk'] = df['Produk'].str.split().str[0] + " " + (df.index % 40).astype(str)
+    return df
+
+
+def _acuan(sumber):
+    """Ringkasan dihitung ulang dari semua baris mentah (cara lama dashboard bulanan)."""
+    semua = pd.concat([agregasi_produk(df).assign(Tahun=t, Bulan=b).reset_index()
+                       for t, b, df in sumber.values()])
+    per_bulan = semua.groupby(['Tahun', 'Bulan'])[list(KOLOM_UKURAN)].sum().reset_index()
+    return semua, per_bulan
+
+
+def _cek(kubus, sumber):
+    semua, per_bulan = _acuan(sumber)
+    ringkasan = kubus.ringkasan_bulanan()
+    pd.testing.assert_frame_equal(ringkasan[['Tahun', 'Bulan', *KOLOM_UKURAN]], per_bulan,
+                                  check_dtype=False)
+
+    terbaik = kubus.bulan_terbaik()
+    acuan = per_bulan.loc[per_bulan['Jumlah'].idxmax()]
+    assert (terbaik['Tahun'], terbaik['Bulan']) == (acuan['Tahun'], acuan['Bulan'])
+
+    for (tahun, bulan), isi in semua.groupby(['Tahun', 'Bulan']):
+        for ukuran in KOLOM_UKURAN:
+            top = kubus.produk_bulan(tahun, bulan, ukuran).head(5)
+            total = isi.groupby('Produk')[ukuran].sum()
+            # Nilai Top 5 harus sama; urutan produk dengan nilai seri boleh beda
+            assert top.tolist() == total.nlargest(5).tolist()
+            assert (total[top.index] == top).all()
+
+
+@pytest.fixture
+def sumber():
+    return {
+        'a': (2024, 1, _bulan(600, 1)),
+        'b': (2024, 2, _bulan(900, 2)),
+        'c': (2024, 2, _bulan(300, 3)),   # file kedua untuk bulan yang sama
+        'd': (2023, 12, _bulan(500, 4)),
+    }
+
+
+def test_tambah_ganti_hapus_bulan(sumber):
+    kubus = KubusRingkasan()
+    assert kubus.kosong()
+    for kunci, (tahun, bulan, df) in sumber.items():
+        kubus.tambah_bulan(kunci, df, tahun, bulan)
+        _cek(kubus, {k: sumber[k] for k in list(sumber)[:list(sumber).index(kunci) + 1]})
+    assert kubus.punya('c')
+
+    # Ganti isi bulan terbaik dengan file yang jauh lebih kecil
+    terbaik = kubus.bulan_terbaik()
+    kunci = next(k for k, (t, b, _) in sumber.items() if (t, b) == (terbaik['Tahun'], terbaik['Bulan']))
+    sumber[kunci] = (*sumber[kunci][:2], _bulan(50, 5))
+    kubus.tambah_bulan(kunci, sumber[kunci][2], *sumber[kunci][:2])
+    _cek(kubus, sumber)
+
+    # Bulan baru yang lebih besar dari semua bulan lain langsung jadi bulan terbaik
+    sumber['e'] = (2024, 3, _bulan(5_000, 6))
+    kubus.tambah_bulan('e', sumber['e'][2], 2024, 3)
+    _cek(kubus, sumber)
+    assert (kubus.bulan_terbaik()['Tahun'], kubus.bulan_terbaik()['Bulan']) == (2024, 3)
+
+    # File dihapus dari upload
+    kubus.pertahankan(['a', 'c', 'd'])
+    for kunci in ('b', 'e'):
+        del sumber[kunci]
+    assert not kubus.punya('e')
+    _cek(kubus, sumber)
+
+    kubus.pertahankan([])
+    assert kubus.kosong()
+
+
+def test_produk_kosong_tetap_ikut_total_bulan():
+    df = pd.DataFrame({'Produk': ['a', None, 'b'], 'Jumlah': [1, 5, 2]})
+    kubus = KubusRingkasan()
+    kubus.tambah_bulan('a', df, 2024, 1)
+    kubus.tambah_bulan('b', df.assign(Produk=df['Produk'].astype('category')), 2024, 1)
+
+    # Sama seperti df_all.groupby([...])['Jumlah'].sum() yang lama
+    assert kubus.ringkasan_bulanan()['Jumlah'].tolist() == [16]
+    assert kubus.bulan_terbaik()['Jumlah'] == 16
+    # Produk kosong tidak masuk peringkat Top 5
+    assert kubus.produk_bulan(2024, 1).to_dict() == {'b': 4, 'a': 2}
@@ -0,0 +1,36 @@
+import io
+
+import pandas as pd
+
+from analitik_penjualan.ekspor import CacheEkspor, tulis_ekspor
+
+
+def _bolak_balik_parquet(df, chunk):
+    tujuan = io.BytesIO()
+    tulis_ekspor(df, 'parquet', tujuan, chunk=chunk)
+    tujuan.seek(0)
+    return pd.read_parquet(tujuan)
+
+
+def test_parquet_skema_sama_untuk_semua_potongan():
+    # Potongan kedua hanya berisi None: tanpa skema bersama tipenya berbeda
+    df = pd.DataFrame({'a': [1] * 5 + [None] * 5}, dtype=object)
+    hasil = _bolak_balik_parquet(df, chunk=5)
+    assert hasil['a'].tolist()[:5] == [1] * 5
+    assert hasil['a'].isna().sum() == 5
+
+
+def test_parquet_kolom_kategori_per_potongan():
+    df = pd.DataFrame({'Kategori': pd.Categorical(['Laris', 'Laris', 'Sangat Laris', 'Kurang Laris']),
+                       'Total': [1.5, 2.0, 3.25, 0.0]})
+    hasil = _bolak_balik_parquet(df, chunk=2)
+    pd.testing.assert_frame_equal(hasil.astype({'Kategori': str}), df.astype({'Kategori': str}))
+
+
+def test_cache_ekspor_per_kunci_dan_format():
+    cache = CacheEkspor(folder=None)
+    df = pd.DataFrame({'Produk': ['a', 'b'], 'Jumlah': [1, 2]})
+    pertama = cache.ambil('kunci', df, 'csv.gz')
+    assert cache.ambil('kunci', df, 'csv.gz') is pertama
+    cache.ambil('kunci', df, 'parquet')
+    assert (cache.statistik()['hits'], cache.statistik()['misses']) == (1, 2)
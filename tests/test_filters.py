@@ -0,0 +1,59 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from analitik_penjualan.filters import IndeksFilter
+
+KATEGORI = ['Kurang Laris', 'Laris', 'Sangat Laris']
+
+
+@pytest.fixture(scope="module")
+def data():
+    rng = np.random.default_rng(7)
+    n = 5_000
+    df = pd.DataFrame({
+        'Kategori': pd.Categorical(rng.choice(KATEGORI, n), categories=KATEGORI, ordered=True),
+        'Pembeli': rng.integers(0, 50, n),
+        'Juta': rng.gamma(1.0, 2.0, n).round(2),
+    })
+    df.loc[::97, 'Juta'] = np.nan
+    return df
+
+
+def _mask(df, anggota, rentang):
+    """Filter asli dashboard: boolean mask per kolom lalu di-AND."""
+    mask = pd.Series(True, index=df.index)
+    for kolom, pilihan in anggota.items():
+        mask &= df[kolom].isin(pilihan)
+    for kolom, (bawah, atas) in rentang.items():
+        mask &= df[kolom].between(bawah, atas)
+    return np.flatnonzero(mask.to_numpy())
+
+
+@pytest.mark.parametrize("anggota, rentang", [
+    ({'Kategori': ['Laris', 'Sangat Laris']}, {'Pembeli': (5, 30), 'Juta': (0.5, 4.0)}),
+    ({'Kategori': ['Laris']}, {}),
+    ({}, {'Juta': (1.0, 1.0)}),
+    ({'Kategori': []}, {'Pembeli': (10, 20)}),
+    ({}, {'Pembeli': (100, 200)}),
+])
+def test_cari_sama_dengan_mask(data, anggota, rentang):
+    indeks = IndeksFilter(data, ['Pembeli', 'Juta'], ['Kategori'])
+    posisi = indeks.cari(anggota=anggota, rentang=rentang)
+    assert posisi is not None
+    np.testing.assert_array_equal(posisi, _mask(data, anggota, rentang))
+
+
+def test_cari_tanpa_filter_aktif(data):
+    indeks = IndeksFilter(data, ['Pembeli', 'Juta'], ['Kategori'])
+    # Semua kategori dipilih & slider di batas penuh: tidak ada yang tersaring
+    rentang = {'Pembeli': indeks.batas('Pembeli')}
+    assert indeks.cari(anggota={'Kategori': KATEGORI}, rentang=rentang) is None
+    assert indeks.batas('Juta') == (data['Juta'].min(), data['Juta'].max())
+
+
+def test_batas_abaikan_nan():
+    df = pd.DataFrame({'x': [3.0, np.nan, -1.0, 7.5, np.nan], 'y': [np.nan] * 5})
+    indeks = IndeksFilter(df, ['x', 'y'])
+    assert indeks.batas('x') == (-1.0, 7.5)
+    assert all(np.isnan(indeks.batas('y')))